@@ -30,7 +30,7 @@ class ColorPickerFieldSerializer(FieldSerializer):
     def to_internal_value(self, data):
         data = super().to_internal_value(data)
         # Check if the parameters are compliant
-        format = data.get('color_format')
+        format = data['parameters'].get('color_format')
         if format is None:
             self.fail('missing_parameter')
 
@@ -0,0 +1,267 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from formidable.models import Access, Field, Item, Validation
+from formidable.register import FieldSerializerRegister, load_serializer
+from formidable.serializers import FormidableSerializer
+from formidable.serializers.fields import (
+    BASE_FIELDS, FieldSerializer, is_bulk_compatible
+)
+
+ACCESSES = [
+    {'access_id': access_id, 'level': 'EDITABLE'}
+    for access_id in ('padawan', 'jedi', 'jedi-master', 'human', 'robot')
+]
+
+
+def make_field(index, **kwargs):
+    field = {
+        'slug': 'field-{}'.format(index),
+        'label': 'Field {}'.format(index),
+        'type_id': 'dropdown',
+        'accesses': ACCESSES,
+        'items': [
+            {'value': 'a', 'label': 'A'},
+            {'value': 'b', 'label': 'B', 'description': 'The B'},
+        ],
+        'validations': [
+            {'type': 'MINLENGTH', 'value': '2', 'message': 'Too short'},
+        ],
+        'defaults': ['a'],
+    }
+    field.update(kwargs)
+    return field
+
+
+def make_schema(size):
+    return {
+        'label': 'bulk',
+        'description': 'bulk',
+        'fields': [make_field(index) for index in range(size)],
+    }
+
+
+class BulkWriteTestCase(TestCase):
+
+    def save(self, data, instance=None):
+        serializer = FormidableSerializer(instance=instance, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as context:
+            instance = serializer.save()
+        return instance, len(context.captured_queries)
+
+    def test_create_constant_queries(self):
+        _, small = self.save(make_schema(2))
+        formidable, large = self.save(make_schema(20))
+        self.assertEqual(small, large)
+        self.assertEqual(formidable.fields.count(), 20)
+        self.assertEqual(
+            Access.objects.filter(field__form=formidable).count(), 100
+        )
+
+    def test_update_constant_queries(self):
+        small, _ = self.save(make_schema(2))
+        large, _ = self.save(make_schema(20))
+        _, small_count = self.save(make_schema(3), instance=small)
+        _, large_count = self.save(make_schema(30), instance=large)
+        self.assertEqual(small_count, large_count)
+
+    def test_round_trip(self):
+        formidable, _ = self.save(make_schema(3))
+        data = FormidableSerializer(formidable).data
+        self.assertEqual(
+            [field['slug'] for field in data['fields']],
+            ['field-0', 'field-1', 'field-2'],
+        )
+        field = data['fields'][1]
+        self.assertEqual(len(field['accesses']), 5)
+        self.assertEqual(
+            field['items'], [
+                {'value': 'a', 'label': 'A', 'description': None},
+                {'value': 'b', 'label': 'B', 'description': 'The B'},
+            ]
+        )
+        self.assertEqual(field['defaults'], ['a'])
+        self.assertEqual(field['validations'][0]['type'], 'MINLENGTH')
+
+    def test_update(self):
+        formidable, _ = self.save(make_schema(3))
+        access_ids = set(
+            Access.objects.filter(field__slug='field-0')
+            .values_list('pk', flat=True)
+        )
+        item_a = Item.objects.get(field__slug='field-0', value='a')
+        data = make_schema(0)
+        data['fields'] = [
+            make_field(
+                3, label='New field', accesses=[
+                    {'access_id': 'padawan', 'level': 'REQUIRED'}
+                ],
+            ),
+            make_field(
+                0, label='Updated', items=[
+                    {'value': 'c', 'label': 'C'},
+                    {'value': 'a', 'label': 'AA'},
+                ],
+                validations=[], defaults=['c'],
+            ),
+        ]
+        self.save(data, instance=formidable)
+
+        fields = list(formidable.fields.order_by('order'))
+        self.assertEqual(
+            [(field.slug, field.label, field.order) for field in fields],
+            [('field-3', 'New field', 0), ('field-0', 'Updated', 1)]
+        )
+        # Accesses and items are updated in place
+        self.assertEqual(
+            set(fields[1].accesses.values_list('pk', flat=True)), access_ids
+        )
+        item = fields[1].items.get(value='a')
+        self.assertEqual(item.pk, item_a.pk)
+        self.assertEqual((item.label, item.order), ('AA', 1))
+        self.assertEqual(
+            list(fields[1].items.order_by('order').values_list('value')),
+            [('c',), ('a',)]
+        )
+        self.assertFalse(fields[1].validations.exists())
+        self.assertEqual(
+            list(fields[1].defaults.values_list('value', flat=True)), ['c']
+        )
+        self.assertEqual(
+            dict(fields[0].accesses.values_list('access_id', 'level')), {
+                'padawan': 'REQUIRED', 'jedi': 'EDITABLE',
+                'jedi-master': 'EDITABLE', 'human': 'EDITABLE',
+                'robot': 'EDITABLE',
+            }
+        )
+        self.assertFalse(
+            Field.objects.filter(slug__in=['field-1', 'field-2']).exists()
+        )
+        self.assertEqual(
+            Validation.objects.filter(field__form=formidable).count(), 1
+        )
+
+
+class DiffUpdateTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        serializer = FormidableSerializer(data=make_schema(10))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.formidable = serializer.save()
+
+    def get_writes(self, data):
+        serializer = FormidableSerializer(instance=self.formidable, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as context:
+            serializer.save()
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+            and 'formidable_formidable' not in query['sql']
+        ]
+
+    def test_no_changes(self):
+        self.assertEqual(self.get_writes(make_schema(10)), [])
+
+    def test_one_label(self):
+        data = make_schema(10)
+        data['fields'][4]['label'] = 'Changed'
+        writes = self.get_writes(data)
+        self.assertEqual(len(writes), 1)
+        self.assertIn('UPDATE "formidable_field" SET "label"', writes[0])
+        self.assertEqual(
+            Field.objects.get(form=self.formidable, slug='field-4').label,
+            'Changed'
+        )
+
+    def test_one_item(self):
+        data = make_schema(10)
+        data['fields'][4]['items'][1]['label'] = 'Changed'
+        writes = self.get_writes(data)
+        self.assertEqual(len(writes), 1)
+        self.assertIn('UPDATE "formidable_item" SET "label"', writes[0])
+
+    def test_validations_by_position(self):
+        validation = Validation.objects.get(
+            field__form=self.formidable, field__slug='field-4'
+        )
+        data = make_schema(10)
+        data['fields'][4]['validations'] = [
+            {'type': 'MINLENGTH', 'value': '2'},
+            {'type': 'MAXLENGTH', 'value': '8'},
+        ]
+        data['fields'][5]['validations'] = []
+        writes = self.get_writes(data)
+        self.assertEqual(len(writes), 3)
+
+        validations = list(
+            Validation.objects.filter(field__slug='field-4').order_by('pk')
+        )
+        self.assertEqual(validations[0].pk, validation.pk)
+        # Omitted columns are reset, as if the row had been replaced
+        self.assertIsNone(validations[0].message)
+        self.assertEqual(
+            [(v.type, v.value) for v in validations],
+            [('MINLENGTH', '2'), ('MAXLENGTH', '8')]
+        )
+        self.assertFalse(
+            Validation.objects.filter(field__slug='field-5').exists()
+        )
+
+    def test_defaults_by_position(self):
+        data = make_schema(10)
+        data['fields'][4]['defaults'] = ['b']
+        writes = self.get_writes(data)
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(
+            list(
+                Field.objects.get(form=self.formidable, slug='field-4')
+                .defaults.values_list('value', flat=True)
+            ),
+            ['b']
+        )
+
+
+class BulkFallbackTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.field_register = FieldSerializerRegister.get_instance()
+        self.created = []
+
+        @load_serializer(self.field_register)
+        class CustomFieldSerializer(FieldSerializer):
+            type_id = 'custom_type_id'
+
+            class Meta(FieldSerializer.Meta):
+                fields = BASE_FIELDS
+
+            def create(serializer, validated_data):
+                field = super().create(validated_data)
+                self.created.append(field.slug)
+                return field
+
+        self.addCleanup(self.field_register.pop, 'custom_type_id')
+
+    def test_is_bulk_compatible(self):
+        self.assertTrue(
+            is_bulk_compatible(self.field_register['dropdown']())
+        )
+        self.assertFalse(
+            is_bulk_compatible(self.field_register['custom_type_id']())
+        )
+
+    def test_fallback(self):
+        data = make_schema(2)
+        data['fields'].append({
+            'slug': 'custom', 'label': 'Custom', 'type_id': 'custom_type_id',
+            'accesses': ACCESSES,
+        })
+        serializer = FormidableSerializer(data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        formidable = serializer.save()
+        self.assertEqual(self.created, ['custom'])
+        self.assertEqual(formidable.fields.count(), 3)
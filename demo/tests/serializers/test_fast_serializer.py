@@ -0,0 +1,180 @@
+import json
+import os
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from formidable import constants, validators
+from formidable.accesses import AccessObject
+from formidable.forms import FormidableForm, fields, widgets
+from formidable.register import FieldSerializerRegister, load_serializer
+from formidable.serializers import FormidableSerializer
+from formidable.serializers.fast import FastFormidableSerializer
+from formidable.serializers.fields import BASE_FIELDS, FieldSerializer
+from formidable.views import FormidableDetail
+
+from demo import formidable_accesses
+from demo.extra_field_toolbox import ColorPickerField
+from demo.extra_field_toolbox import (
+    ColorPickerFieldSerializer as BaseColorPickerFieldSerializer
+)
+
+FIXTURES = (
+    'form-data.json',
+    'form-data-changed.json',
+    'drop-down-conditions.json',
+    'multiple-choices-conditions.json',
+    'conditions-contextualization.json',
+    'form-schema-extra-fields.json',
+)
+
+FIXTURES_ACCESSES = [
+    AccessObject(id='TEST_ROLE', label='Test role'),
+    AccessObject(id='TEST_ROLE2', label='Test role 2'),
+]
+
+
+def schema_to_payload(schema):
+    """
+    Turn a form schema fixture into a payload for the builder serializer.
+
+    Fields may lack a label in a schema, and their parameters are sent as
+    plain attributes to the serializer.
+    """
+    for field in schema['fields']:
+        field.setdefault('label', field['slug'])
+        field.update(field.pop('parameters', None) or {})
+    return schema
+
+
+class KitchenSinkForm(FormidableForm):
+    title = fields.TitleField(label='Jedi Onboarding')
+    helptext = fields.HelpTextField(text='youhou')
+    separator = fields.SeparatorField()
+    name = fields.CharField(
+        label='Name', help_text='Your name', accesses={
+            'padawan': constants.REQUIRED, 'jedi': constants.READONLY,
+        },
+        validators=[
+            validators.MinLengthValidator(2),
+            validators.RegexValidator(r'^\w+$', message='Letters only'),
+        ],
+    )
+    bio = fields.CharField(widget=widgets.Textarea, default='Once upon')
+    weapons = fields.MultipleChoiceField(
+        choices=(('sword', 'Light Sword'), ('gun', 'Blaster')),
+        defaults=['sword'],
+    )
+    apero = fields.ChoiceField(
+        widget=widgets.RadioSelect,
+        choices=(('yes', 'Yes'), ('no', 'No')),
+    )
+    agree = fields.BooleanField(label='Do you agree?')
+    email = fields.EmailField()
+    age = fields.NumberField(validators=[validators.GTEValidator(18)])
+    birth = fields.DateField(validators=[validators.AgeAboveValidator(21)])
+    proof = fields.FileField()
+
+
+class FastFormidableSerializerTestCase(TestCase):
+    fixtures_path = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+
+    def setUp(self):
+        super().setUp()
+        self.field_register = FieldSerializerRegister.get_instance()
+
+        @load_serializer(self.field_register)
+        class ColorPickerFieldSerializer(BaseColorPickerFieldSerializer):
+            pass
+
+    def tearDown(self):
+        self.field_register.pop(BaseColorPickerFieldSerializer.type_id)
+        super().tearDown()
+
+    def assertSameRendering(self, formidable):
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(FastFormidableSerializer(formidable).data),
+            renderer.render(FormidableSerializer(formidable).data),
+        )
+
+    @mock.patch(
+        'demo.formidable_accesses.get_accesses',
+        return_value=formidable_accesses.get_accesses() + FIXTURES_ACCESSES,
+    )
+    def test_fixtures(self, get_accesses):
+        for name in FIXTURES:
+            with self.subTest(fixture=name):
+                with open(os.path.join(self.fixtures_path, name)) as fd:
+                    data = schema_to_payload(json.load(fd))
+                serializer = FormidableSerializer(data=data)
+                self.assertTrue(serializer.is_valid(), serializer.errors)
+                self.assertSameRendering(serializer.save())
+
+    def test_all_field_types(self):
+        self.assertSameRendering(KitchenSinkForm.to_formidable(label='sink'))
+
+    def test_parameters(self):
+        class ParametrizedForm(FormidableForm):
+            color = ColorPickerField(parameters={'color_format': 'hex'})
+
+        formidable = ParametrizedForm.to_formidable(label='parameters')
+        data = FastFormidableSerializer(formidable).data
+        self.assertEqual(data['fields'][0]['color_format'], 'hex')
+        self.assertSameRendering(formidable)
+
+    def test_empty_form(self):
+        self.assertSameRendering(FormidableForm.to_formidable(label='empty'))
+
+    def test_fewer_queries(self):
+        formidable = KitchenSinkForm.to_formidable(label='sink')
+        # fields, items, accesses, validations, defaults
+        with self.assertNumQueries(5):
+            FastFormidableSerializer(formidable).data
+
+    def test_fallback(self):
+        custom_type_id = 'custom_type_id'
+
+        @load_serializer(self.field_register)
+        class CustomFieldSerializer(FieldSerializer):
+            type_id = custom_type_id
+
+            class Meta(FieldSerializer.Meta):
+                fields = BASE_FIELDS
+
+            def to_representation(self, instance):
+                field = super().to_representation(instance)
+                field['custom'] = True
+                return field
+
+        self.addCleanup(self.field_register.pop, custom_type_id)
+        formidable = KitchenSinkForm.to_formidable(label='sink')
+        formidable.fields.create(
+            slug='custom', label='Custom', type_id=custom_type_id, order=99,
+        )
+        data = FastFormidableSerializer(formidable).data
+        self.assertTrue(data['fields'][-1]['custom'])
+        self.assertSameRendering(formidable)
+
+
+class FastFormidableDetail(FormidableDetail):
+    use_fast_serializer = True
+
+
+class FastFormidableDetailTestCase(APITestCase):
+
+    def test_view(self):
+        formidable = KitchenSinkForm.to_formidable(label='sink')
+        url = reverse('formidable:form_detail', args=(formidable.pk,))
+        view = FastFormidableDetail.as_view()
+        response = view(APIRequestFactory().get(url), pk=formidable.pk)
+        response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render(FormidableSerializer(formidable).data),
+        )
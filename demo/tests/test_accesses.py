@@ -0,0 +1,122 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from demo import formidable_accesses
+
+from formidable.accesses import (
+    accesses_loaded_once, get_accesses, get_accesses_ids, get_context,
+    get_context_loader, invalidate_accesses
+)
+from formidable.serializers import FormidableSerializer
+
+from .serializers.test_bulk_write import make_schema
+
+ROLES = ['padawan', 'jedi', 'jedi-master', 'human', 'robot']
+
+
+class AccessRegistryTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch(
+            'demo.formidable_accesses.get_accesses',
+            wraps=formidable_accesses.get_accesses,
+        )
+        self.loader = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(invalidate_accesses)
+
+    def test_not_cached_by_default(self):
+        self.assertEqual([access.id for access in get_accesses()], ROLES)
+        self.assertEqual(get_accesses_ids(), frozenset(ROLES))
+        self.assertEqual(self.loader.call_count, 2)
+
+    @override_settings(FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT=None)
+    def test_cached(self):
+        accesses = get_accesses()
+        self.assertEqual(get_accesses(), accesses)
+        self.assertEqual(get_accesses_ids(), frozenset(ROLES))
+        self.assertEqual(self.loader.call_count, 1)
+        # Callers get their own list
+        accesses.pop()
+        self.assertEqual(len(get_accesses()), 5)
+
+    @override_settings(FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT=None)
+    def test_save_calls_loader_once(self):
+        serializer = FormidableSerializer(data=make_schema(30))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_save_with_default_settings(self):
+        serializer = FormidableSerializer(data=make_schema(30))
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(self.loader.call_count, 1)
+        serializer.save()
+        self.assertEqual(self.loader.call_count, 1)
+
+    def test_loaded_once(self):
+        with accesses_loaded_once():
+            get_accesses()
+            with accesses_loaded_once():
+                self.assertEqual(get_accesses_ids(), frozenset(ROLES))
+            get_accesses()
+            self.assertEqual(self.loader.call_count, 1)
+        get_accesses()
+        self.assertEqual(self.loader.call_count, 2)
+
+    @override_settings(FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT=60)
+    def test_timeout(self):
+        with mock.patch('formidable.accesses.time.monotonic') as monotonic:
+            monotonic.return_value = 1000
+            get_accesses()
+            monotonic.return_value = 1060
+            get_accesses()
+            self.assertEqual(self.loader.call_count, 1)
+            monotonic.return_value = 1061
+            get_accesses()
+            self.assertEqual(self.loader.call_count, 2)
+
+    @override_settings(FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT=None)
+    def test_invalidation(self):
+        get_accesses()
+        invalidate_accesses()
+        get_accesses()
+        self.assertEqual(self.loader.call_count, 2)
+
+        def get_other_accesses():
+            return formidable_accesses.get_accesses()[:1]
+
+        with mock.patch(
+                'demo.formidable_accesses.get_other_accesses',
+                get_other_accesses, create=True):
+            with self.settings(
+                    FORMIDABLE_ACCESS_RIGHTS_LOADER='demo.formidable_accesses'
+                                                    '.get_other_accesses'):
+                self.assertEqual(get_accesses_ids(), {'padawan'})
+        self.assertEqual(get_accesses_ids(), frozenset(ROLES))
+
+
+class ContextLoaderTestCase(TestCase):
+
+    def test_imported_once(self):
+        get_context_loader()
+        request = mock.Mock(session={'role': 'jedi'})
+        with mock.patch('formidable.utils.import_module') as import_module:
+            self.assertEqual(get_context(request, {}), 'jedi')
+            self.assertEqual(import_module.call_count, 0)
+
+    def test_setting_changed(self):
+        get_context_loader()
+
+        def get_robot_context(request, kwargs):
+            return 'robot'
+
+        with mock.patch(
+                'demo.formidable_accesses.get_robot_context',
+                get_robot_context, create=True):
+            with self.settings(
+                    FORMIDABLE_CONTEXT_LOADER='demo.formidable_accesses'
+                                              '.get_robot_context'):
+                self.assertEqual(get_context(None, {}), 'robot')
@@ -0,0 +1,170 @@
+import datetime
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from formidable import constants, validators
+from formidable.forms import FormidableForm, fields
+from formidable.forms.validations.batch import validate_batch
+from formidable.utils import iter_chunks
+
+CONDITIONS = [
+    {
+        'name': 'Ask the age of adults',
+        'action': 'display_iff',
+        'fields_ids': ['age'],
+        'tests': [
+            {'field_id': 'adult', 'operator': 'eq', 'values': [True]},
+        ],
+    },
+]
+
+ROWS = [
+    {'name': 'Luke', 'adult': True, 'age': '19'},
+    {'name': 'L'},
+    {'adult': True, 'age': '12'},
+    {'name': 'Leia', 'age': '12'},
+]
+
+
+class BatchForm(FormidableForm):
+    name = fields.CharField(
+        accesses={'padawan': constants.REQUIRED},
+        validators=[validators.MinLengthValidator(2)],
+    )
+    adult = fields.BooleanField(accesses={'padawan': constants.EDITABLE})
+    age = fields.NumberField(
+        accesses={'padawan': constants.EDITABLE},
+        validators=[validators.GTEValidator(18)],
+    )
+    birth = fields.DateField(
+        accesses={'padawan': constants.EDITABLE},
+        validators=[validators.AgeAboveValidator(18)],
+    )
+
+
+class BatchValidationTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.formidable = BatchForm.to_formidable(label='batch')
+        self.formidable.conditions = CONDITIONS
+        self.formidable.save()
+
+    def get_expected(self, rows):
+        form_class = self.formidable.get_django_form_class(role='padawan')
+        expected = []
+        for data in rows:
+            form = form_class(data=data)
+            form.is_valid()
+            expected.append({
+                name: list(messages) for name, messages in form.errors.items()
+            })
+        return expected
+
+    def test_validate_batch(self):
+        errors = list(validate_batch(self.formidable, ROWS, role='padawan'))
+        self.assertEqual(errors, self.get_expected(ROWS))
+        self.assertEqual(errors[0], {})
+        self.assertEqual(set(errors[1]), {'name'})
+        self.assertEqual(set(errors[2]), {'name', 'age'})
+        self.assertEqual(set(errors[3]), set())
+
+    def test_built_once(self):
+        rows = ROWS * 10
+        with self.assertNumQueries(5):
+            errors = list(validate_batch(self.formidable, rows, 'padawan'))
+        self.assertEqual(len(errors), 40)
+
+    def test_process_pool(self):
+        rows = ROWS * 10
+        errors = validate_batch(
+            self.formidable, iter(rows), role='padawan', processes=2,
+            chunksize=3,
+        )
+        self.assertEqual(list(errors), self.get_expected(rows))
+
+    @override_settings(FORMIDABLE_PROCESS_START_METHOD='spawn')
+    def test_process_pool_spawn(self):
+        errors = validate_batch(
+            self.formidable, ROWS, role='padawan', processes=2, chunksize=1,
+        )
+        self.assertEqual(list(errors), self.get_expected(ROWS))
+
+    @override_settings(FORMIDABLE_PROCESS_START_METHOD='unknown')
+    def test_process_pool_unknown_start_method(self):
+        with patch('formidable.utils.logger.warning') as warning:
+            errors = list(validate_batch(
+                self.formidable, ROWS, role='padawan', processes=2,
+            ))
+        self.assertEqual(errors, self.get_expected(ROWS))
+        self.assertEqual(warning.call_count, 1)
+
+    def test_process_pool_closes_connections(self):
+        # The connection of the test case is in a transaction, and kept
+        with patch.object(connection, 'close') as close:
+            list(validate_batch(
+                self.formidable, ROWS, role='padawan', processes=2,
+            ))
+        close.assert_not_called()
+        with patch.object(connection, 'close') as close, \
+                patch.object(connection, 'in_atomic_block', False):
+            list(validate_batch(
+                self.formidable, ROWS, role='padawan', processes=2,
+            ))
+        close.assert_called_once_with()
+
+    def test_reference_date(self):
+        rows = [{'name': 'Luke', 'birth': '2000-06-01'}] * 4
+        for processes in (None, 2):
+            errors = list(validate_batch(
+                self.formidable, rows, 'padawan', processes=processes,
+                chunksize=3, today=datetime.date(2018, 5, 31),
+            ))
+            self.assertEqual([set(error) for error in errors], [{'birth'}] * 4)
+            errors = list(validate_batch(
+                self.formidable, rows, 'padawan', processes=processes,
+                chunksize=3, today=datetime.date(2018, 6, 1),
+            ))
+            self.assertEqual(errors, [{}] * 4)
+
+    def test_iter_chunks(self):
+        self.assertEqual(
+            list(iter_chunks(range(5), 2)), [[0, 1], [2, 3], [4]]
+        )
+        self.assertEqual(list(iter_chunks([], 2)), [])
+
+
+class BatchValidationEndPointTestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.formidable = BatchForm.to_formidable(label='batch')
+        self.url = reverse(
+            'formidable:form_batch_validation', args=[self.formidable.pk]
+        )
+        session = self.client.session
+        session['role'] = 'padawan'
+        session.save()
+
+    def test_validate(self):
+        res = self.client.post(self.url, ROWS, format='json')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.data), 4)
+        self.assertEqual(res.data[0], {})
+        self.assertEqual(list(res.data[1]), ['name'])
+
+    def test_not_a_list(self):
+        res = self.client.post(self.url, ROWS[0], format='json')
+        self.assertEqual(res.status_code, 422)
+        res = self.client.post(self.url, [ROWS[0], 'name'], format='json')
+        self.assertEqual(res.status_code, 422)
+
+    def test_formidable_does_not_exist(self):
+        url = reverse('formidable:form_batch_validation', args=[9999])
+        res = self.client.post(url, ROWS, format='json')
+        self.assertEqual(res.status_code, 404)
@@ -0,0 +1,167 @@
+import threading
+from copy import deepcopy
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from formidable.callbacks import (
+    ThreadPoolCallbackExecutor, get_callback_executor
+)
+
+from . import form_data, form_data_items
+
+CALLBACK = 'demo.callback_save'
+CALLBACK_EXCEPTION = 'demo.callback_exception'
+RECORDING_EXECUTOR = 'tests.test_callback_executor.RecordingExecutor'
+
+
+class RecordingExecutor:
+
+    submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(fn)
+        fn(*args)
+
+
+def invalid_form_data():
+    data = deepcopy(form_data_items)
+    data['fields'][0].pop('items')
+    return data
+
+
+@override_settings(FORMIDABLE_CALLBACK_EXECUTOR=RECORDING_EXECUTOR)
+class OnCommitTestCase(APITransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        RecordingExecutor.submitted = []
+
+    @override_settings(FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK)
+    def test_success_after_commit(self):
+        with patch(CALLBACK) as patched_callback:
+            res = self.client.post(
+                reverse('formidable:form_create'), form_data, format='json'
+            )
+            self.assertEqual(res.status_code, 201)
+            self.assertEqual(patched_callback.call_count, 1)
+        self.assertEqual(len(RecordingExecutor.submitted), 1)
+
+    @override_settings(FORMIDABLE_POST_CREATE_CALLBACK_FAIL=CALLBACK)
+    def test_failure(self):
+        with patch(CALLBACK) as patched_callback:
+            res = self.client.post(
+                reverse('formidable:form_create'), invalid_form_data(),
+                format='json'
+            )
+            self.assertEqual(res.status_code, 422)
+            self.assertEqual(patched_callback.call_count, 1)
+        self.assertEqual(len(RecordingExecutor.submitted), 1)
+
+
+@override_settings(FORMIDABLE_CALLBACK_EXECUTOR=RECORDING_EXECUTOR)
+class NotCommittedTestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        RecordingExecutor.submitted = []
+
+    @override_settings(FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK)
+    def test_success_not_committed(self):
+        # The test transaction is never committed
+        with patch(CALLBACK) as patched_callback:
+            res = self.client.post(
+                reverse('formidable:form_create'), form_data, format='json'
+            )
+            self.assertEqual(res.status_code, 201)
+            self.assertEqual(patched_callback.call_count, 0)
+        self.assertEqual(RecordingExecutor.submitted, [])
+
+
+@override_settings(
+    FORMIDABLE_CALLBACK_EXECUTOR='formidable.callbacks'
+                                 '.ThreadPoolCallbackExecutor'
+)
+class ThreadPoolTestCase(APITransactionTestCase):
+
+    @override_settings(FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK)
+    def test_callback_thread(self):
+        called = threading.Event()
+        threads = []
+
+        labels = []
+
+        def callback(request):
+            threads.append(threading.current_thread())
+            labels.append(request.data['label'])
+            called.set()
+
+        with patch(CALLBACK, side_effect=callback):
+            res = self.client.post(
+                reverse('formidable:form_create'), form_data, format='json'
+            )
+            self.assertEqual(res.status_code, 201)
+            self.assertTrue(called.wait(5))
+        self.assertIsNot(threads[0], threading.current_thread())
+        self.assertEqual(labels, [form_data['label']])
+
+    @override_settings(
+        FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK_EXCEPTION
+    )
+    def test_callback_exception_logger(self):
+        logged = threading.Event()
+        with patch('formidable.views.logger.error',
+                   side_effect=lambda *args: logged.set()):
+            res = self.client.post(
+                reverse('formidable:form_create'), form_data, format='json'
+            )
+            self.assertEqual(res.status_code, 201)
+            self.assertTrue(logged.wait(5))
+
+    def test_executor(self):
+        executor = get_callback_executor()
+        self.assertIsInstance(executor, ThreadPoolCallbackExecutor)
+        self.assertIs(executor, get_callback_executor())
+        with self.settings(FORMIDABLE_CALLBACK_MAX_WORKERS=1):
+            self.assertIsNot(executor, get_callback_executor())
+
+
+class ThreadPoolCallbackExecutorTestCase(TestCase):
+
+    def test_queue_full(self):
+        executor = ThreadPoolCallbackExecutor(max_workers=1, queue_size=1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        threads = []
+
+        def callback():
+            threads.append(threading.current_thread())
+            release.wait(5)
+
+        executor.submit(callback)
+        executor.submit(callback)
+        # The queue is full, the callback runs in the calling thread
+        release.set()
+        with patch('formidable.callbacks.logger.warning') as warning:
+            executor.submit(callback)
+        self.assertEqual(warning.call_count, 1)
+        self.assertIs(threads[-1], threading.current_thread())
+
+    def test_exception(self):
+        executor = ThreadPoolCallbackExecutor(max_workers=1, queue_size=0)
+        self.addCleanup(executor.shutdown)
+
+        def callback():
+            raise ValueError
+
+        with patch('formidable.callbacks.logger.exception') as exception:
+            executor.submit(callback).result(5)
+        self.assertEqual(exception.call_count, 1)
+        # The slot of the callback has been released
+        self.assertIsNotNone(executor.submit(lambda: None))
+
+    def test_not_set(self):
+        self.assertIsNone(get_callback_executor())
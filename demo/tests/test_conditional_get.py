@@ -0,0 +1,113 @@
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework.test import APITestCase
+
+from formidable import constants
+from formidable.forms import FormidableForm, fields
+from formidable.models import Formidable
+from formidable.serializers import FormidableSerializer
+
+
+class PolledForm(FormidableForm):
+    first_name = fields.CharField(accesses={'padawan': constants.REQUIRED})
+    last_name = fields.CharField(accesses={'padawan': constants.HIDDEN})
+
+
+class ConditionalGetTestCase(APITestCase):
+    url_name = 'formidable:form_detail'
+
+    def setUp(self):
+        super().setUp()
+        self.formidable = PolledForm.to_formidable(label='polled')
+        self.url = reverse(self.url_name, args=(self.formidable.pk,))
+        session = self.client.session
+        session['role'] = 'padawan'
+        session.save()
+
+    def update_form(self):
+        data = FormidableSerializer(self.formidable).data
+        data['label'] = 'updated'
+        serializer = FormidableSerializer(instance=self.formidable, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+    def test_headers(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.formidable.refresh_from_db()
+        self.assertEqual(
+            response['Last-Modified'],
+            http_date(self.formidable.updated_at.timestamp())
+        )
+
+    def test_if_none_match(self):
+        etag = self.client.get(self.url)['ETag']
+        # Session and form row only
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+    def test_if_none_match_modified_form(self):
+        etag = self.client.get(self.url)['ETag']
+        self.update_form()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['label'], 'updated')
+
+    def test_if_none_match_recreated_form(self):
+        # Same revision as the form recreated below
+        self.formidable.bump_revision()
+        etag = self.client.get(self.url)['ETag']
+        pk = self.formidable.pk
+        self.formidable.delete()
+        formidable = PolledForm.to_formidable(
+            instance=Formidable.objects.create(pk=pk, label='recreated')
+        )
+        self.assertEqual(formidable.revision, self.formidable.revision)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_no_updated_at(self):
+        Formidable.objects.filter(pk=self.formidable.pk).update(
+            updated_at=None
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_found(self):
+        url = reverse(self.url_name, args=(self.formidable.pk + 1,))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+
+class ContextFormConditionalGetTestCase(ConditionalGetTestCase):
+    url_name = 'formidable:context_form_detail'
+
+    def test_etag_role(self):
+        etag = self.client.get(self.url)['ETag']
+        session = self.client.session
+        session['role'] = 'jedi'
+        session.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['fields']), 2)
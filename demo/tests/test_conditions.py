@@ -1,6 +1,7 @@
 import os
 import json
 import copy
+import random
 
 from django.test import TestCase
 from django.test.utils import override_settings
@@ -11,6 +12,10 @@ from formidable.forms import (
     get_dynamic_form_class,
     get_dynamic_form_class_from_schema
 )
+from formidable.forms.conditions import (
+    ConditionsCycleError, ConditionsIndex, ConditionTest, DisplayIffCondition,
+    get_evaluation_order
+)
 from formidable.serializers.forms import (
     ContextFormSerializer, FormidableSerializer, contextualize
 )
@@ -551,6 +556,258 @@ class MultipleChoiceConditionsTestCase(TestCase):
         self.assertTrue('c' in form.cleaned_data)
 
 
+def get_removed_fields(conditions, cleaned_data):
+    """
+    Evaluate every condition, as BaseDynamicForm used to.
+    """
+    condition_targets = {}
+    for condition in conditions:
+        keep_fields = condition.keep_fields(cleaned_data)
+        for field_id in condition.fields_ids:
+            condition_targets.setdefault(field_id, []).append(keep_fields)
+    return [k for k, v in condition_targets.items() if not any(v)]
+
+
+class NeverCondition(DisplayIffCondition):
+
+    def keep_fields(self, cleaned_data):
+        return False
+
+
+class ConditionsIndexTestCase(TestCase):
+
+    def test_same_removed_fields(self):
+        rand = random.Random(42)
+        tested = ['t{}'.format(i) for i in range(20)]
+        conditions = []
+        for index in range(1000):
+            tests = [
+                ConditionTest(
+                    rand.choice(tested), 'eq', [rand.choice('abc')]
+                )
+                for _ in range(rand.randint(0, 3))
+            ]
+            fields_ids = rand.sample(['f{}'.format(i) for i in range(50)], 2)
+            conditions.append(
+                DisplayIffCondition(fields_ids, '#{}'.format(index), tests)
+            )
+        index = ConditionsIndex(conditions)
+        for _ in range(50):
+            cleaned_data = {
+                field_id: rand.choice(['a', 'b', 'c', ['a', 'b'], []])
+                for field_id in rand.sample(tested, 10)
+            }
+            self.assertEqual(
+                index.get_removed_fields(cleaned_data),
+                get_removed_fields(conditions, cleaned_data),
+            )
+
+    def test_multiple_values(self):
+        conditions = [
+            DisplayIffCondition(
+                ['a'], 'a', [ConditionTest('choices', 'eq', ['x', 'y'])]
+            ),
+        ]
+        index = ConditionsIndex(conditions)
+        self.assertEqual(index.get_removed_fields({'choices': ['y']}), [])
+        self.assertEqual(index.get_removed_fields({'choices': ['z']}), ['a'])
+        self.assertEqual(index.get_removed_fields({'choices': 'x'}), [])
+        self.assertEqual(index.get_removed_fields({'choices': 'y'}), ['a'])
+        self.assertEqual(index.get_removed_fields({}), ['a'])
+
+    def test_not_indexed(self):
+        conditions = [
+            DisplayIffCondition(
+                ['a', 'b'], 'a', [ConditionTest('checkbox', 'eq', [True])]
+            ),
+            NeverCondition(['b'], 'never', []),
+        ]
+        index = ConditionsIndex(conditions)
+        self.assertEqual(index.others, conditions[1:])
+        self.assertEqual(
+            index.get_removed_fields({'checkbox': True}), []
+        )
+        self.assertEqual(
+            index.get_removed_fields({'checkbox': False}), ['a', 'b']
+        )
+
+
+@override_settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True)
+class SkipHiddenConditionTestCase(ConditionTestCase):
+    pass
+
+
+@override_settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True)
+class SkipHiddenDropdownConditionsTestCase(DropdownConditionsTestCase):
+    pass
+
+
+@override_settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True)
+class SkipHiddenMultipleChoiceConditionsTestCase(
+        MultipleChoiceConditionsTestCase):
+    pass
+
+
+class EvaluationOrderTestCase(TestCase):
+
+    def test_order(self):
+        targets = [['c'], ['b'], ['d'], ['e']]
+        tested = [['b'], ['a'], ['c', 'b'], ['a']]
+        self.assertEqual(get_evaluation_order(targets, tested), [1, 0, 2, 3])
+
+    def test_cycle(self):
+        targets = [['b'], ['c'], ['a'], ['d']]
+        tested = [['a'], ['b'], ['c'], ['c']]
+        with self.assertRaises(ConditionsCycleError) as context:
+            get_evaluation_order(targets, tested)
+        # The last condition depends on the cycle, without being part of it
+        self.assertEqual(context.exception.positions, [0, 1, 2])
+        self.assertEqual(
+            get_evaluation_order(targets, tested, strict=False), [0, 1, 2, 3]
+        )
+
+    def test_self_cycle(self):
+        with self.assertRaises(ConditionsCycleError):
+            get_evaluation_order([['a']], [['a']])
+
+
+class CascadeConditionsTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        form_class = test_conditions_fixtures.DropdownConditionsTestForm
+        formidable = form_class.to_formidable(label='cascade')
+        # main_dropdown displays a, which displays b
+        formidable.conditions = [
+            {
+                'name': 'Show b if a is filled with "b"',
+                'action': 'display_iff',
+                'fields_ids': ['b'],
+                'tests': [
+                    {'field_id': 'a', 'operator': 'eq', 'values': ['b']},
+                ]
+            },
+            {
+                'name': 'Show a if value "ab" selected',
+                'action': 'display_iff',
+                'fields_ids': ['a'],
+                'tests': [
+                    {
+                        'field_id': 'main_dropdown',
+                        'operator': 'eq',
+                        'values': ['ab'],
+                    }
+                ]
+            },
+        ]
+        self.form_class = get_dynamic_form_class(formidable, 'padawan')
+
+    def get_cleaned_data(self, data):
+        form = self.form_class(data)
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.cleaned_data
+
+    def test_independent(self):
+        data = {'main_dropdown': 'b', 'a': 'b', 'b': 'B'}
+        self.assertEqual(self.get_cleaned_data(data), {
+            'main_dropdown': 'b', 'b': 'B', 'c': '',
+        })
+
+    @override_settings(FORMIDABLE_CONDITIONS_CASCADE=True)
+    def test_cascade(self):
+        data = {'main_dropdown': 'b', 'a': 'b', 'b': 'B'}
+        self.assertEqual(self.get_cleaned_data(data), {
+            'main_dropdown': 'b', 'c': '',
+        })
+        data['main_dropdown'] = 'ab'
+        self.assertEqual(self.get_cleaned_data(data), {
+            'main_dropdown': 'ab', 'a': 'b', 'b': 'B', 'c': '',
+        })
+
+    @override_settings(
+        FORMIDABLE_CONDITIONS_CASCADE=True, FORMIDABLE_SKIP_HIDDEN_FIELDS=True
+    )
+    def test_cascade_skip_hidden_fields(self):
+        self.test_cascade()
+
+    @override_settings(FORMIDABLE_CONDITIONS_CASCADE=True)
+    def test_cycle(self):
+        conditions = [
+            DisplayIffCondition(
+                ['a'], 'a', [ConditionTest('b', 'eq', ['b'])]
+            ),
+            DisplayIffCondition(
+                ['b'], 'b', [ConditionTest('a', 'eq', ['a'])]
+            ),
+        ]
+        index = ConditionsIndex(conditions)
+        self.assertEqual(
+            index.get_removed_fields({'a': 'a', 'b': 'b'}), ['a', 'b']
+        )
+
+
+class SkipHiddenFieldsTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        form_class = test_conditions_fixtures.DropdownConditionsTestForm
+        formidable = form_class.to_formidable(label='skip')
+        formidable.conditions = [
+            {
+                'name': 'Show a if value "ab" selected',
+                'action': 'display_iff',
+                'fields_ids': ['a'],
+                'tests': [
+                    {
+                        'field_id': 'main_dropdown',
+                        'operator': 'eq',
+                        'values': ['ab'],
+                    }
+                ]
+            },
+        ]
+        self.form_class = get_dynamic_form_class(formidable, 'padawan')
+        self.cleaned = []
+        self.form_class.base_fields['a'].validators.append(
+            self.cleaned.append
+        )
+
+    def validate(self, data):
+        form = self.form_class(data)
+        return form.is_valid(), form.cleaned_data, form.errors
+
+    def test_hidden_field_not_cleaned(self):
+        data = {'main_dropdown': 'b', 'a': 'A', 'b': 'B'}
+        expected = self.validate(data)
+        self.assertEqual(self.cleaned, ['A'])
+        with self.settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True):
+            self.assertEqual(self.validate(data), expected)
+        self.assertEqual(self.cleaned, ['A'])
+
+    def test_displayed_field_cleaned(self):
+        data = {'main_dropdown': 'ab', 'a': 'A', 'c': 'C'}
+        expected = self.validate(data)
+        with self.settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True):
+            self.assertEqual(self.validate(data), expected)
+        self.assertEqual(self.cleaned, ['A', 'A'])
+
+    def test_errors_order(self):
+        data = {'main_dropdown': 'z'}
+        expected = self.validate(data)
+        with self.settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True):
+            _, _, errors = self.validate(data)
+        self.assertEqual(list(errors), list(expected[2]))
+
+    def test_not_indexed(self):
+        self.form_class._conditions_index.others.append(
+            NeverCondition(['c'], 'never', [])
+        )
+        with self.settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True):
+            self.assertFalse(self.form_class({}).can_skip_hidden_fields())
+            self.validate({'main_dropdown': 'b', 'a': 'A'})
+        self.assertEqual(self.cleaned, ['A'])
+
+
 class ConditionSerializerTestCase(TestCase):
 
     payload = {
@@ -617,6 +874,33 @@ class ConditionSerializerTestCase(TestCase):
         serializer = FormidableSerializer(data=self.payload)
         self.assertFalse(serializer.is_valid())
 
+    def get_cyclic_payload(self):
+        payload = copy.deepcopy(self.payload)
+        payload['conditions'].append({
+            'name': 'Cycle',
+            'action': 'display_iff',
+            'fields_ids': ['checkbox'],
+            'tests': [
+                {'field_id': 'foo', 'operator': 'eq', 'values': ['foo']},
+            ]
+        })
+        return payload
+
+    def test_cycle(self):
+        serializer = FormidableSerializer(data=self.get_cyclic_payload())
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    @override_settings(FORMIDABLE_CONDITIONS_CASCADE=True)
+    def test_cycle_cascade(self):
+        serializer = FormidableSerializer(data=self.payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer = FormidableSerializer(data=self.get_cyclic_payload())
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            serializer.errors['non_field_errors'][0],
+            'Conditions (My Name, Cycle) depend on each other'
+        )
+
 
 class ConditionContextualizationTest(TestCase):
 
@@ -0,0 +1,149 @@
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from formidable import constants
+from formidable.context_forms import get_cache_key, get_context_form
+from formidable.forms import FormidableForm, fields
+from formidable.models import Formidable
+from formidable.serializers import FormidableSerializer
+
+
+class StoredForm(FormidableForm):
+    first_name = fields.CharField(accesses={'padawan': constants.REQUIRED})
+    last_name = fields.CharField(accesses={'padawan': constants.HIDDEN})
+
+
+@override_settings(FORMIDABLE_CONTEXT_FORM_CACHE='default')
+class ContextFormStoreTestCase(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.formidable = StoredForm.to_formidable(label='stored')
+        self.url = reverse(
+            'formidable:context_form_detail', args=(self.formidable.pk,)
+        )
+        session = self.client.session
+        session['role'] = 'padawan'
+        session.save()
+
+    def tearDown(self):
+        cache.clear()
+        super().tearDown()
+
+    def test_disabled(self):
+        with self.settings(FORMIDABLE_CONTEXT_FORM_CACHE=None):
+            self.assertIsNone(get_context_form(self.formidable, 'padawan'))
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(
+            cache.get(get_cache_key(self.formidable, 'padawan'))
+        )
+
+    def test_same_document(self):
+        with self.settings(FORMIDABLE_CONTEXT_FORM_CACHE=None):
+            expected = self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], expected['Content-Type'])
+        self.assertEqual(response.content, expected.content)
+        fields = json.loads(response.content.decode())['fields']
+        self.assertEqual([field['slug'] for field in fields], ['first_name'])
+
+    def test_built_for_every_role(self):
+        get_context_form(self.formidable, 'padawan')
+        for role in ('padawan', 'jedi', 'jedi-master', 'human', 'robot'):
+            self.assertIsNotNone(
+                cache.get(get_cache_key(self.formidable, role))
+            )
+        jedi = json.loads(get_context_form(self.formidable, 'jedi').decode())
+        self.assertEqual(
+            [field['slug'] for field in jedi['fields']],
+            ['first_name', 'last_name']
+        )
+
+    def test_served_from_store(self):
+        self.client.get(self.url)
+        # Session and form row only
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_role(self):
+        document = get_context_form(self.formidable, 'sith')
+        self.assertEqual(json.loads(document.decode())['fields'], [])
+        self.assertIsNone(cache.get(get_cache_key(self.formidable, 'sith')))
+
+    def test_new_revision(self):
+        self.client.get(self.url)
+        data = FormidableSerializer(self.formidable).data
+        data['fields'][0]['label'] = 'First name'
+        serializer = FormidableSerializer(instance=self.formidable, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        response = self.client.get(self.url)
+        fields = json.loads(response.content.decode())['fields']
+        self.assertEqual(fields[0]['label'], 'First name')
+
+    def test_deleted_form(self):
+        # Same revision as the form recreated below
+        self.formidable.bump_revision()
+        self.client.get(self.url)
+        pk = self.formidable.pk
+        keys = [
+            get_cache_key(self.formidable, role)
+            for role in ('padawan', 'jedi')
+        ]
+        stale = cache.get(keys[0])
+        self.assertIsNotNone(stale)
+        self.formidable.delete()
+        self.assertEqual(cache.get_many(keys), {})
+
+        # A stale document left in the store, e.g. by a rolled back deletion
+        cache.set(keys[0], stale)
+
+        class OtherForm(FormidableForm):
+            nickname = fields.CharField(
+                accesses={'padawan': constants.REQUIRED}
+            )
+
+        formidable = OtherForm.to_formidable(
+            instance=Formidable.objects.create(pk=pk, label='other')
+        )
+        self.assertEqual(formidable.revision, self.formidable.revision)
+        self.assertNotEqual(get_cache_key(formidable, 'padawan'), keys[0])
+        document = json.loads(get_context_form(formidable, 'padawan'))
+        self.assertEqual(
+            [field['slug'] for field in document['fields']], ['nickname']
+        )
+
+    def test_command(self):
+        other = StoredForm.to_formidable(label='other')
+        out = StringIO()
+        call_command('formidable_build_context_forms', stdout=out)
+        self.assertIn('2 form(s)', out.getvalue())
+        for formidable in (self.formidable, other):
+            self.assertIsNotNone(
+                cache.get(get_cache_key(formidable, 'robot'))
+            )
+
+    def test_command_ids(self):
+        other = StoredForm.to_formidable(label='other')
+        call_command(
+            'formidable_build_context_forms', str(other.pk), stdout=StringIO()
+        )
+        self.assertIsNotNone(cache.get(get_cache_key(other, 'robot')))
+        self.assertIsNone(cache.get(get_cache_key(self.formidable, 'robot')))
+
+    def test_command_disabled(self):
+        with self.settings(FORMIDABLE_CONTEXT_FORM_CACHE=None):
+            with self.assertRaises(CommandError):
+                call_command('formidable_build_context_forms')
@@ -9,13 +9,14 @@ from django.test.utils import CaptureQueriesContext
 
 import django_perf_rec
 
-from formidable import constants
+from formidable import constants, validators
 from formidable.forms import FormidableForm, fields
 from formidable.json_migrations.utils import merge_context_forms
 from formidable.models import Formidable
 from formidable.serializers.fields import BASE_FIELDS, FieldSerializerRegister
 from formidable.serializers.forms import (
-    ContextFormSerializer, FormidableSerializer, contextualize
+    ContextFormSerializer, FormidableSerializer, contextualize,
+    contextualize_all
 )
 
 RENDER_BASE_FIELDS = list(set(BASE_FIELDS) - set(['order']))
@@ -468,6 +469,68 @@ class RenderContextSerializer(TestCase):
         self.assertTrue(readonly_field['disabled'])
         self.assertFalse(readonly_field['required'])
 
+    def get_conditional_schema(self):
+
+        class TestForm(FormidableForm):
+            choice = fields.ChoiceField(
+                choices=(('a', 'A'), ('b', 'B')),
+                accesses={'padawan': constants.HIDDEN},
+            )
+            name = fields.CharField(
+                accesses={'jedi': constants.READONLY},
+                validators=[validators.MinLengthValidator(2)],
+            )
+            age = fields.NumberField(accesses={'robot': constants.REQUIRED})
+
+        form = TestForm.to_formidable(label='title')
+        schema = form.to_json()
+        schema['conditions'] = [
+            {
+                'name': 'Ask the name for a',
+                'action': 'display_iff',
+                'fields_ids': ['name', 'age'],
+                'tests': [
+                    {'field_id': 'choice', 'operator': 'eq', 'values': ['a']},
+                ],
+            },
+        ]
+        return schema
+
+    def test_contextualize_copy_free(self):
+        schema = self.get_conditional_schema()
+        original = copy.deepcopy(schema)
+        for role in ('padawan', 'jedi', 'robot'):
+            contextualized_data = contextualize(schema, role)
+            self.assertEqual(schema, original)
+            # The nested values are shared
+            self.assertIs(
+                contextualized_data['fields'][-1]['validations'],
+                schema['fields'][-1]['validations'],
+            )
+        jedi = contextualize(schema, 'jedi')
+        self.assertIs(
+            jedi['fields'][0]['items'], schema['fields'][0]['items']
+        )
+        self.assertTrue(jedi['fields'][1]['disabled'])
+        self.assertEqual(len(jedi['conditions']), 1)
+        self.assertEqual(
+            sorted(jedi['conditions'][0]['fields_ids']), ['age', 'name']
+        )
+        # Without the tested field, the condition is dropped
+        self.assertEqual(contextualize(schema, 'padawan')['conditions'], [])
+
+    def test_contextualize_all(self):
+        schema = self.get_conditional_schema()
+        roles = ['padawan', 'jedi', 'jedi-master', 'human', 'robot']
+        self.assertEqual(
+            contextualize_all(schema),
+            {role: contextualize(schema, role) for role in roles}
+        )
+        self.assertEqual(
+            contextualize_all(schema, ['robot']),
+            {'robot': contextualize(schema, 'robot')}
+        )
+
     def test_queryset(self):
 
         class TestForm(FormidableForm):
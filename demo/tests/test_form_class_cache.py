@@ -0,0 +1,181 @@
+from django.test import TestCase, override_settings
+
+from formidable import constants
+from formidable.forms import (
+    FormidableForm, contextualize_schema, fields,
+    get_dynamic_form_class_from_schema
+)
+from formidable.forms.cache import form_class_cache, schema_form_class_cache
+from formidable.forms.field_builder import FormFieldFactory
+from formidable.models import Formidable
+from formidable.serializers import FormidableSerializer
+from formidable.views import ValidateViewFromSchema
+
+
+class CachedForm(FormidableForm):
+    first_name = fields.CharField(accesses={'padawan': constants.REQUIRED})
+    last_name = fields.CharField(accesses={'padawan': constants.HIDDEN})
+
+
+class FormClassCacheTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        form_class_cache.clear()
+        self.formidable = CachedForm.to_formidable(label='cached')
+
+    def tearDown(self):
+        form_class_cache.clear()
+        super().tearDown()
+
+    def test_disabled_by_default(self):
+        form_class = self.formidable.get_django_form_class()
+        self.assertIsNot(form_class, self.formidable.get_django_form_class())
+        self.assertEqual(len(form_class_cache), 0)
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_hit(self):
+        form_class = self.formidable.get_django_form_class(role='padawan')
+        with self.assertNumQueries(0):
+            cached = self.formidable.get_django_form_class(role='padawan')
+        self.assertIs(form_class, cached)
+        self.assertEqual(list(cached.declared_fields), ['first_name'])
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_key_role(self):
+        padawan = self.formidable.get_django_form_class(role='padawan')
+        jedi = self.formidable.get_django_form_class(role='jedi')
+        self.assertIsNot(padawan, jedi)
+        self.assertEqual(
+            list(jedi.declared_fields), ['first_name', 'last_name']
+        )
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_key_field_factory(self):
+        form_class = self.formidable.get_django_form_class()
+        other_factory = FormFieldFactory(field_map={'text': object})
+        self.assertNotEqual(
+            FormFieldFactory().get_cache_key(),
+            other_factory.get_cache_key(),
+        )
+        self.assertIs(
+            form_class,
+            self.formidable.get_django_form_class(
+                field_factory=FormFieldFactory()
+            )
+        )
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=2)
+    def test_lru_eviction(self):
+        padawan = self.formidable.get_django_form_class(role='padawan')
+        self.formidable.get_django_form_class(role='jedi')
+        # Touch the padawan class, the jedi one is now the oldest one
+        self.formidable.get_django_form_class(role='padawan')
+        self.formidable.get_django_form_class(role='human')
+        self.assertEqual(len(form_class_cache), 2)
+        self.assertIs(
+            padawan, self.formidable.get_django_form_class(role='padawan')
+        )
+        with self.assertNumQueries(5):
+            self.formidable.get_django_form_class(role='jedi')
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_key_revision(self):
+        form_class = self.formidable.get_django_form_class()
+        # Modified by another process, the local cache is not invalidated
+        Formidable.objects.filter(pk=self.formidable.pk).update(revision=42)
+        formidable = Formidable.objects.get(pk=self.formidable.pk)
+        self.assertIsNot(form_class, formidable.get_django_form_class())
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=10)
+    def test_invalidated_by_serializer_update(self):
+        form_class = self.formidable.get_django_form_class(role='padawan')
+        data = FormidableSerializer(self.formidable).data
+        data['fields'][0]['label'] = 'First name'
+        serializer = FormidableSerializer(instance=self.formidable, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        new_class = self.formidable.get_django_form_class(role='padawan')
+        self.assertIsNot(form_class, new_class)
+        self.assertEqual(
+            new_class.declared_fields['first_name'].label, 'First name'
+        )
+
+    @override_settings(FORMIDABLE_FORM_CLASS_CACHE_SIZE=10)
+    def test_invalidated_by_to_formidable(self):
+        form_class = self.formidable.get_django_form_class(role='padawan')
+
+        class OtherForm(FormidableForm):
+            nickname = fields.CharField()
+
+        OtherForm.to_formidable(instance=self.formidable)
+        new_class = self.formidable.get_django_form_class(role='padawan')
+        self.assertIsNot(form_class, new_class)
+        self.assertEqual(list(new_class.declared_fields), ['nickname'])
+
+
+class SchemaFormClassCacheTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        schema_form_class_cache.clear()
+        formidable = CachedForm.to_formidable(label='cached')
+        self.schema = contextualize_schema(
+            FormidableSerializer(formidable).data, 'padawan'
+        )
+
+    def tearDown(self):
+        schema_form_class_cache.clear()
+        super().tearDown()
+
+    def test_disabled_by_default(self):
+        form_class = get_dynamic_form_class_from_schema(self.schema)
+        self.assertIsNot(
+            form_class, get_dynamic_form_class_from_schema(self.schema)
+        )
+        self.assertEqual(len(schema_form_class_cache), 0)
+
+    @override_settings(FORMIDABLE_SCHEMA_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_hit(self):
+        form_class = get_dynamic_form_class_from_schema(self.schema)
+        # An equal schema, with its keys in another order
+        schema = dict(reversed(list(self.schema.items())))
+        self.assertIs(form_class, get_dynamic_form_class_from_schema(schema))
+        self.assertEqual(list(form_class.declared_fields), ['first_name'])
+
+    @override_settings(FORMIDABLE_SCHEMA_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_key_schema(self):
+        form_class = get_dynamic_form_class_from_schema(self.schema)
+        self.schema['fields'][0]['label'] = 'First name'
+        new_class = get_dynamic_form_class_from_schema(self.schema)
+        self.assertIsNot(form_class, new_class)
+        self.assertEqual(
+            new_class.declared_fields['first_name'].label, 'First name'
+        )
+
+    @override_settings(FORMIDABLE_SCHEMA_FORM_CLASS_CACHE_SIZE=10)
+    def test_cache_key_field_factory(self):
+        form_class = get_dynamic_form_class_from_schema(self.schema)
+        builder = ValidateViewFromSchema.ValidationFileFieldBuilder
+        factory = FormFieldFactory(field_map={'file': builder})
+        validation_class = get_dynamic_form_class_from_schema(
+            self.schema, factory
+        )
+        self.assertIsNot(form_class, validation_class)
+        self.assertIs(
+            validation_class,
+            get_dynamic_form_class_from_schema(
+                self.schema,
+                FormFieldFactory(field_map={'file': builder})
+            )
+        )
+
+    @override_settings(FORMIDABLE_SCHEMA_FORM_CLASS_CACHE_SIZE=10)
+    def test_not_serializable(self):
+        self.schema['description'] = object()
+        form_class = get_dynamic_form_class_from_schema(self.schema)
+        self.assertIsNot(
+            form_class, get_dynamic_form_class_from_schema(self.schema)
+        )
+        self.assertEqual(len(schema_form_class_cache), 0)
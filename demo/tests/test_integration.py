@@ -15,6 +15,7 @@ from freezegun import freeze_time
 from rest_framework.test import APITestCase
 
 from formidable.models import Formidable
+from formidable.views import ValidateView
 from formidable.accesses import get_accesses
 from formidable.forms import FormidableForm, fields, get_dynamic_form_class
 from formidable import validators, constants
@@ -645,6 +646,32 @@ class TestValidationFromSchemaEndPoint(TestValidationEndPoint):
     url = 'form_validation_schema'
 
 
+class TestValidationPlanEndPoint(TestValidationEndPoint):
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(ValidateView, 'use_validation_plan', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_errors(self):
+        session = self.client.session
+        session['role'] = 'padawan'
+        session.save()
+        url = reverse(self.url, args=[self.formidable.pk])
+        res = self.client.post(url, {'last_name': 'Gé'}, format='json')
+        self.assertEqual(res.status_code, 400)
+        with patch.object(ValidateView, 'use_validation_plan', False):
+            expected = self.client.post(
+                url, {'last_name': 'Gé'}, format='json'
+            )
+        self.assertEqual(res.content, expected.content)
+
+
+class TestValidationPlanFromSchemaEndPoint(TestValidationPlanEndPoint):
+    url = 'form_validation_schema'
+
+
 class TestConditionalRulesWithDropDowns(FormidableAPITestCase):
     def test_can_validate_form_with_dropdown_conditional_fields(self):
         url = 'formidable:form_validation'
@@ -1,4 +1,5 @@
 import copy
+from unittest.mock import patch
 
 from django.test import TestCase, override_settings
 from django.urls import reverse
@@ -8,9 +9,9 @@ from rest_framework.test import APITestCase
 
 from formidable.models import Formidable
 from formidable.serializers import FormidableSerializer
-from formidable.security import get_clean_function
+from formidable.security import get_clean_function, sanitize, sanitize_many
 
-from . import form_data
+from . import form_data, form_data_items
 
 
 XSS = """<IMG SRC=/ onerror="alert(String.fromCharCode(88,83,83))"></img>"""
@@ -43,6 +44,23 @@ class XSSLoaderTestCase(TestCase):
         clean_func = get_clean_function()
         assert clean_func(XSS) != XSS, clean_func(XSS)
 
+    @override_settings(
+        DJANGO_FORMIDABLE_SANITIZE_FUNCTION="demo.security.clean_alert")
+    def test_imported_once(self):
+        get_clean_function()
+        with patch('formidable.security.import_string') as import_string:
+            self.assertEqual(sanitize('alert(1)'), '(1)')
+            self.assertEqual(import_string.call_count, 0)
+
+    @override_settings(
+        DJANGO_FORMIDABLE_SANITIZE_FUNCTION="demo.security.clean_alert")
+    def test_sanitize_many(self):
+        self.assertEqual(
+            sanitize_many(['alert(1)', '', None, 'ok']),
+            ['(1)', '', None, 'ok']
+        )
+        self.assertIsNone(sanitize(None))
+
 
 class XSSViewsTestCase(APITestCase):
 
@@ -180,6 +198,17 @@ class XSSSerializerTestCase(TestCase):
         field = formidable.fields.first()
         assert field.placeholder == XSS_RESULT
 
+    def test_create_item_label_via_serializer(self):
+        _form_data = copy.deepcopy(form_data_items)
+        _form_data['fields'][0]['items'][0]['label'] = XSS
+
+        serializer = FormidableSerializer(data=_form_data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        field = serializer.instance.fields.first()
+        item = field.items.order_by('order').first()
+        assert item.label == XSS_RESULT
+
 
 class XSSInstructionFieldTestCase(APITestCase):
     """
@@ -2,7 +2,9 @@ import os
 import json
 from django.test import TestCase
 
-from formidable.json_migrations.utils import merge_context_forms
+from formidable.json_migrations.utils import (
+    add_fields, merge_context_forms, uncontextualize_field
+)
 
 TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -56,5 +58,59 @@ class JSONMigrationUtilsTestCase(TestCase):
 
         self.assertDictEqual(expected_form, result)
 
+    def test_add_fields_order(self):
+        fields = [
+            {'slug': slug, 'accesses': [1]} for slug in ('a', 'b', 'c')
+        ]
+        add_fields(fields, [
+            {'slug': slug, 'accesses': [2]} for slug in ('x', 'b', 'y', 'z')
+        ])
+        self.assertEqual(
+            [field['slug'] for field in fields], ['x', 'a', 'b', 'y', 'z', 'c']
+        )
+        self.assertEqual(fields[2]['accesses'], [1, 2])
+
+    def test_merge_many_roles(self):
+        roles = ['role-{}'.format(index) for index in range(20)]
+        forms = {
+            role: {
+                'label': 'label', 'description': '', 'id': 1,
+                'fields': [
+                    {
+                        'slug': 'field-{}'.format(index), 'disabled': False,
+                        'required': index == 0, 'items': [],
+                    }
+                    # Each role sees one field out of its index + 2
+                    for index in range(100) if index % (rank + 2)
+                ],
+            } for rank, role in enumerate(roles)
+        }
+        form = merge_context_forms(forms)
+        self.assertEqual(
+            sorted(field['slug'] for field in form['fields']),
+            sorted('field-{}'.format(index) for index in range(1, 100))
+        )
+        for field in form['fields']:
+            self.assertEqual(
+                [access['access_id'] for access in field['accesses']
+                 if access['level'] != 'HIDDEN'],
+                [role for rank, role in enumerate(roles)
+                 if int(field['slug'][6:]) % (rank + 2)]
+            )
+            self.assertEqual(len(field['accesses']), 20)
+
+    def test_uncontextualize_field_copy(self):
+        field = {
+            'slug': 'a', 'disabled': True, 'required': False, 'items': [],
+        }
+        new_field = uncontextualize_field(field, 'jedi')
+        self.assertEqual(
+            new_field, {
+                'slug': 'a', 'items': [],
+                'accesses': [{'access_id': 'jedi', 'level': 'READONLY'}],
+            }
+        )
+        self.assertIn('disabled', field)
+
     def dict_sort_key(self, obj):
         return obj['access_id']
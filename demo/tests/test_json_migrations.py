@@ -1,9 +1,10 @@
 import mock
 import os
+from glob import glob
 
 from django.test import TestCase
 
-from formidable.json_migrations import migrate
+from formidable.json_migrations import _load_migrations, migrate
 
 
 @mock.patch('formidable.json_migrations.HERE',
@@ -77,3 +78,11 @@ class JSONMigrationTestCase(TestCase):
         migrate(data, 2)
         self.assertEqual(migrate_1.call_count, 0)
         self.assertEqual(migrate_2.call_count, 0)
+
+    def test_migrations_discovered_once(self):
+        _load_migrations.cache_clear()
+        with mock.patch('formidable.json_migrations.glob',
+                        wraps=glob) as mocked_glob:
+            migrate(self._fixtures())
+            migrate(self._fixtures(version=1), 1)
+        self.assertEqual(mocked_glob.call_count, 1)
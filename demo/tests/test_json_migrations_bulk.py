@@ -0,0 +1,105 @@
+import copy
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from formidable import json_version
+from formidable.json_migrations import migrate
+from formidable.json_migrations.bulk import (
+    migrate_documents, migrate_json_lines
+)
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_documents():
+    with open(os.path.join(
+            TESTS_DIR, 'fixtures', 'migration-form-data-input.json')) as f:
+        contextualized = json.load(f)
+    contextualized['version'] = 2
+    latest = {
+        'label': 'latest', 'description': '', 'fields': [],
+        'conditions': [], 'version': json_version,
+    }
+    return [contextualized, latest, copy.deepcopy(contextualized)]
+
+
+def get_expected():
+    return [
+        migrate(document, document['version'])
+        for document in get_documents()
+    ]
+
+
+class MigrateDocumentsTestCase(TestCase):
+
+    def test_migrate_documents(self):
+        migrated = list(migrate_documents(iter(get_documents())))
+        self.assertEqual(migrated, get_expected())
+        self.assertEqual(
+            [document['version'] for document in migrated], [json_version] * 3
+        )
+        self.assertNotIn('presets', migrated[0])
+
+    def test_process_pool(self):
+        migrated = migrate_documents(
+            get_documents() * 5, processes=2, chunksize=2
+        )
+        self.assertEqual(list(migrated), get_expected() * 5)
+
+    def test_migrate_json_lines(self):
+        lines = [json.dumps(document) for document in get_documents()]
+        lines.insert(1, '\n')
+        migrated = migrate_json_lines(lines, processes=2, chunksize=1)
+        self.assertEqual(
+            [json.loads(line) for line in migrated], get_expected()
+        )
+
+
+class MigrateJSONCommandTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.input = os.path.join(directory.name, 'input.jsonl')
+        self.output = os.path.join(directory.name, 'output.jsonl')
+        with open(self.input, 'w') as f:
+            for document in get_documents():
+                f.write(json.dumps(document) + '\n')
+
+    def test_files(self):
+        out = StringIO()
+        call_command('formidable_migrate_json', self.input, self.output,
+                     stdout=out)
+        with open(self.output) as f:
+            migrated = [json.loads(line) for line in f]
+        self.assertEqual(migrated, get_expected())
+        self.assertIn('Migrated 3 document(s)', out.getvalue())
+
+    def test_stdout(self):
+        out, err = StringIO(), StringIO()
+        call_command('formidable_migrate_json', self.input, '-',
+                     '--processes', '2', '--chunksize', '1', '--verbosity',
+                     '2', stdout=out, stderr=err)
+        self.assertEqual(
+            [json.loads(line) for line in out.getvalue().splitlines()],
+            get_expected()
+        )
+        self.assertEqual(err.getvalue().count('Migrated'), 4)
+
+    def test_invalid_json(self):
+        with open(self.input, 'a') as f:
+            f.write('{"label": \n')
+        with self.assertRaisesRegex(CommandError, 'Invalid JSON'):
+            call_command('formidable_migrate_json', self.input, self.output,
+                         stdout=StringIO())
+
+    def test_missing_input(self):
+        with self.assertRaises(CommandError):
+            call_command('formidable_migrate_json', self.input + '.missing',
+                         self.output, stdout=StringIO())
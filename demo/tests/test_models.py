@@ -2,6 +2,8 @@ from django.test import TestCase
 
 from formidable import constants
 from formidable.forms import fields, FormidableForm
+from formidable.models import Formidable
+from formidable.serializers import FormidableSerializer
 
 
 class FormTest(FormidableForm):
@@ -84,3 +86,41 @@ class UnicodeTestCase(TestCase):
         field = self.formidable.fields.get(slug='dropdown')
         validation = field.validations.create(value='Value', type='Type')
         self.assertEqual(str(validation), 'Value: Type')
+
+
+class RevisionTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.formidable = FormTest.to_formidable(label='label')
+
+    def test_initial_revision(self):
+        self.assertEqual(self.formidable.revision, 0)
+
+    def test_get_revision(self):
+        with self.assertNumQueries(1):
+            revision = Formidable.get_revision(self.formidable.pk)
+        self.assertEqual(revision, 0)
+
+    def test_get_revision_unknown_form(self):
+        with self.assertRaises(Formidable.DoesNotExist):
+            Formidable.get_revision(self.formidable.pk + 1)
+
+    def test_bump_revision(self):
+        self.formidable.bump_revision()
+        self.formidable.bump_revision()
+        self.assertEqual(self.formidable.revision, 2)
+        self.assertEqual(Formidable.get_revision(self.formidable.pk), 2)
+
+    def test_serializer_update(self):
+        data = FormidableSerializer(self.formidable).data
+        serializer = FormidableSerializer(instance=self.formidable, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        instance = serializer.save()
+        self.assertEqual(instance.revision, 1)
+        self.assertEqual(Formidable.get_revision(self.formidable.pk), 1)
+
+    def test_to_formidable_instance(self):
+        FormTest.to_formidable(instance=self.formidable)
+        self.assertEqual(self.formidable.revision, 1)
+        self.assertEqual(Formidable.get_revision(self.formidable.pk), 1)
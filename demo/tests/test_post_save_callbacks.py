@@ -226,3 +226,31 @@ class ConfigurationLoadingTestCases(TestCase):
     def test_create_fail_unknown(self):
         with self.assertRaises(ImproperlyConfigured):
             check_callback_configuration()
+
+
+class CallbackImportTestCase(APITestCase):
+
+    @override_settings(FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK)
+    def test_imported_once(self):
+        check_callback_configuration()
+        with patch('formidable.views.import_from_string') as importer:
+            for _ in range(2):
+                res = self.client.post(
+                    reverse('formidable:form_create'), form_data,
+                    format='json'
+                )
+                self.assertEqual(res.status_code, 201)
+            self.assertEqual(importer.call_count, 0)
+
+    def test_setting_changed(self):
+        with override_settings(
+                FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK):
+            check_callback_configuration()
+        with override_settings(
+                FORMIDABLE_POST_CREATE_CALLBACK_SUCCESS=CALLBACK_EXCEPTION):
+            with patch(CALLBACK_EXCEPTION) as patched_callback:
+                self.client.post(
+                    reverse('formidable:form_create'), form_data,
+                    format='json'
+                )
+                self.assertEqual(patched_callback.call_count, 1)
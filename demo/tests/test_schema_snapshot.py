@@ -0,0 +1,126 @@
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIRequestFactory
+
+from formidable import constants
+from formidable.forms import FormidableForm, fields
+from formidable.models import Formidable
+from formidable.serializers import FormidableSerializer
+from formidable.views import FormidableDetail
+
+from . import form_data_items
+
+
+class SnapshotForm(FormidableForm):
+    first_name = fields.CharField(accesses={'padawan': constants.REQUIRED})
+    last_name = fields.CharField(accesses={'padawan': constants.HIDDEN})
+    color = fields.ChoiceField(
+        choices=(('red', 'Red'), ('blue', 'Blue')),
+        accesses={'padawan': constants.READONLY},
+    )
+
+
+class SnapshotFormidableDetail(FormidableDetail):
+    use_schema_snapshot = True
+
+
+def save(data, instance=None):
+    serializer = FormidableSerializer(instance=instance, data=data)
+    assert serializer.is_valid(), serializer.errors
+    return serializer.save()
+
+
+class SchemaSnapshotDisabledTestCase(TestCase):
+
+    def test_create(self):
+        formidable = save(form_data_items)
+        self.assertIsNone(formidable.schema_snapshot)
+        self.assertIsNone(formidable.get_schema_snapshot())
+
+    def test_update_drops_snapshot(self):
+        with override_settings(FORMIDABLE_SCHEMA_SNAPSHOT=True):
+            formidable = save(form_data_items)
+        self.assertIsNotNone(formidable.schema_snapshot)
+        save(form_data_items, instance=formidable)
+        formidable = Formidable.objects.get(pk=formidable.pk)
+        self.assertIsNone(formidable.schema_snapshot)
+
+    def test_to_json_fallback(self):
+        formidable = save(form_data_items)
+        self.assertEqual(
+            formidable.to_json(from_snapshot=True), formidable.to_json()
+        )
+
+
+@override_settings(FORMIDABLE_SCHEMA_SNAPSHOT=True)
+class SchemaSnapshotTestCase(TestCase):
+
+    def test_create(self):
+        formidable = save(form_data_items)
+        formidable = Formidable.objects.get(pk=formidable.pk)
+        with self.assertNumQueries(0):
+            data = formidable.to_json(from_snapshot=True)
+        self.assertEqual(data, formidable.to_json())
+
+    def test_update(self):
+        formidable = save(form_data_items)
+        data = formidable.to_json()
+        data['label'] = 'new label'
+        data['fields'][0]['label'] = 'new field label'
+        save(data, instance=formidable)
+
+        formidable = Formidable.objects.get(pk=formidable.pk)
+        snapshot = formidable.to_json(from_snapshot=True)
+        self.assertEqual(snapshot['label'], 'new label')
+        self.assertEqual(snapshot['fields'][0]['label'], 'new field label')
+        self.assertEqual(snapshot, formidable.to_json())
+
+    def test_to_formidable(self):
+        formidable = SnapshotForm.to_formidable(label='snapshot')
+        self.assertEqual(
+            formidable.to_json(from_snapshot=True), formidable.to_json()
+        )
+
+        class OtherForm(FormidableForm):
+            nickname = fields.CharField()
+
+        OtherForm.to_formidable(instance=formidable)
+        formidable = Formidable.objects.get(pk=formidable.pk)
+        snapshot = formidable.to_json(from_snapshot=True)
+        self.assertEqual(
+            [field['slug'] for field in snapshot['fields']], ['nickname']
+        )
+
+    def test_outdated_json_version(self):
+        formidable = SnapshotForm.to_formidable(label='snapshot')
+        formidable.schema_snapshot['version'] -= 1
+        self.assertIsNone(formidable.get_schema_snapshot())
+
+    def test_form_class(self):
+        formidable = SnapshotForm.to_formidable(label='snapshot')
+        formidable = Formidable.objects.get(pk=formidable.pk)
+        for role in (None, 'padawan', 'jedi'):
+            with self.assertNumQueries(0):
+                form_class = formidable.get_django_form_class(
+                    role=role, from_snapshot=True
+                )
+            expected = formidable.get_django_form_class(role=role)
+            self.assertEqual(
+                list(form_class.declared_fields),
+                list(expected.declared_fields),
+            )
+            for name, field in form_class.declared_fields.items():
+                expected_field = expected.declared_fields[name]
+                self.assertEqual(type(field), type(expected_field))
+                self.assertEqual(field.required, expected_field.required)
+                self.assertEqual(field.disabled, expected_field.disabled)
+                self.assertEqual(field.label, expected_field.label)
+
+    def test_detail_view(self):
+        formidable = save(form_data_items)
+        view = SnapshotFormidableDetail.as_view()
+        request = APIRequestFactory().get('/')
+        with self.assertNumQueries(1):
+            response = view(request, pk=formidable.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, formidable.to_json())
@@ -0,0 +1,200 @@
+import copy
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+
+from freezegun import freeze_time
+
+from formidable import constants, validators
+from formidable.forms import (
+    FormidableForm, contextualize_schema, fields, widgets
+)
+from formidable.forms.cache import validation_plan_cache
+from formidable.forms.validations.plan import (
+    ValidationPlan, get_validation_plan, get_validation_plan_from_schema
+)
+from formidable.models import Formidable
+from formidable.serializers import FormidableSerializer
+
+
+class PlannedForm(FormidableForm):
+    title = fields.TitleField(label='Jedi Onboarding')
+    name = fields.CharField(
+        accesses={'padawan': constants.REQUIRED, 'jedi': constants.READONLY},
+        validators=[
+            validators.MinLengthValidator(2),
+            validators.RegexValidator(r'^\w+$', message='Letters only'),
+        ],
+        default='Luke',
+    )
+    weapons = fields.MultipleChoiceField(
+        choices=(('sword', 'Light Sword'), ('gun', 'Blaster')),
+        accesses={'padawan': constants.REQUIRED},
+    )
+    apero = fields.ChoiceField(
+        widget=widgets.RadioSelect,
+        choices=(('yes', 'Yes'), ('no', 'No')),
+    )
+    agree = fields.BooleanField(accesses={'padawan': constants.EDITABLE})
+    email = fields.EmailField(accesses={'padawan': constants.REQUIRED})
+    age = fields.NumberField(
+        accesses={'padawan': constants.EDITABLE},
+        validators=[validators.GTEValidator(18)],
+    )
+    birth = fields.DateField(
+        accesses={'padawan': constants.EDITABLE},
+        validators=[validators.AgeAboveValidator(21)],
+    )
+    proof = fields.FileField(accesses={'padawan': constants.REQUIRED})
+
+
+CONDITIONS = [
+    {
+        'name': 'Adults only',
+        'action': 'display_iff',
+        'fields_ids': ['age', 'birth'],
+        'tests': [
+            {'field_id': 'agree', 'operator': 'eq', 'values': [True]},
+        ],
+    },
+]
+
+DATA = [
+    {},
+    {'name': 'Luke', 'weapons': ['sword'], 'email': 'luke@example.com'},
+    {'name': 'L', 'weapons': ['axe'], 'email': 'luke', 'apero': 'maybe'},
+    {'name': 'Luke Skywalker', 'weapons': 'gun', 'age': 'old'},
+    {'agree': True, 'age': '12', 'birth': '2010-01-01'},
+    {'agree': False, 'age': '12', 'birth': 'yesterday'},
+    {'agree': True, 'age': '42', 'birth': '1970-01-01', 'proof': 'proof'},
+]
+
+
+@freeze_time('2021-01-01')
+class ValidationPlanTestCase(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        validation_plan_cache.clear()
+        self.formidable = PlannedForm.to_formidable(label='planned')
+        self.formidable.conditions = CONDITIONS
+        self.formidable.save()
+
+    def tearDown(self):
+        validation_plan_cache.clear()
+        super().tearDown()
+
+    def assertSameValidation(self, form_class, data):
+        form = form_class(data=data)
+        form.is_valid()
+        cleaned_data, errors = ValidationPlan(form_class).validate(data)
+        self.assertEqual(errors, {
+            name: list(messages) for name, messages in form.errors.items()
+        })
+        self.assertEqual(cleaned_data, form.cleaned_data)
+
+    def test_same_validation(self):
+        for role in (None, 'padawan', 'jedi'):
+            form_class = self.formidable.get_django_form_class(role=role)
+            for data in DATA:
+                with self.subTest(role=role, data=data):
+                    self.assertSameValidation(form_class, data)
+
+    @override_settings(FORMIDABLE_SKIP_HIDDEN_FIELDS=True)
+    def test_same_validation_skip_hidden_fields(self):
+        self.test_same_validation()
+
+    def test_readonly_default(self):
+        plan = get_validation_plan(self.formidable, role='jedi')
+        cleaned_data, errors = plan.validate({'name': 'Vader'})
+        self.assertEqual(cleaned_data['name'], 'Luke')
+        self.assertEqual(errors, {})
+
+    def test_conditions(self):
+        plan = get_validation_plan(self.formidable, role='padawan')
+        cleaned_data, errors = plan.validate({'age': '12'})
+        self.assertNotIn('age', errors)
+        self.assertNotIn('age', cleaned_data)
+        cleaned_data, errors = plan.validate({'agree': True, 'age': '12'})
+        self.assertIn('age', errors)
+        cleaned_data, errors = plan.validate({
+            'agree': True, 'birth': '1970-01-01',
+        })
+        self.assertEqual(cleaned_data['birth'], datetime.date(1970, 1, 1))
+
+    def test_custom_clean(self):
+        form_class = self.formidable.get_django_form_class(role='padawan')
+
+        def clean_email(form):
+            raise ValidationError('No emails')
+
+        form_class.clean_email = clean_email
+        plan = ValidationPlan(form_class)
+        self.assertFalse(plan.compiled)
+        _, errors = plan.validate({'email': 'luke@example.com'})
+        self.assertEqual(errors['email'], ['No emails'])
+        self.assertSameValidation(form_class, {'email': 'luke@example.com'})
+
+    def test_cache_enabled_by_default(self):
+        plan = get_validation_plan(self.formidable, role='padawan')
+        with self.assertNumQueries(0):
+            cached = get_validation_plan(self.formidable, role='padawan')
+        self.assertIs(plan, cached)
+        self.assertEqual(validation_plan_cache.maxsize, 128)
+
+    @override_settings(FORMIDABLE_VALIDATION_PLAN_CACHE_SIZE=0)
+    def test_cache_disabled(self):
+        plan = get_validation_plan(self.formidable, role='padawan')
+        self.assertIsNot(
+            plan, get_validation_plan(self.formidable, role='padawan')
+        )
+        self.assertEqual(len(validation_plan_cache), 0)
+
+    def test_cache_reused_pk(self):
+        get_validation_plan(self.formidable, role='padawan')
+        self.formidable.delete()
+        self.assertEqual(len(validation_plan_cache), 0)
+        # Left over by a form whose creation has been rolled back
+        validation_plan_cache.set((4242, 'padawan', 1, None), object())
+        Formidable.objects.create(pk=4242, label='new')
+        self.assertEqual(len(validation_plan_cache), 0)
+
+    def test_schema_cache(self):
+        schema = contextualize_schema(
+            FormidableSerializer(self.formidable).data, 'padawan'
+        )
+        plan = get_validation_plan_from_schema(schema)
+        self.assertIs(
+            plan, get_validation_plan_from_schema(copy.deepcopy(schema))
+        )
+        self.assertIn('weapons', plan.validate({})[1])
+        schema['fields'] = schema['fields'][:1]
+        self.assertIsNot(plan, get_validation_plan_from_schema(schema))
+
+    @override_settings(FORMIDABLE_VALIDATION_PLAN_CACHE_SIZE=10)
+    def test_cache_hit(self):
+        plan = get_validation_plan(self.formidable, role='padawan')
+        with self.assertNumQueries(0):
+            cached = get_validation_plan(self.formidable, role='padawan')
+            cached.validate({'name': 'Luke'})
+        self.assertIs(plan, cached)
+        self.assertIsNot(
+            plan, get_validation_plan(self.formidable, role='jedi')
+        )
+
+    @override_settings(FORMIDABLE_VALIDATION_PLAN_CACHE_SIZE=10)
+    def test_cache_invalidation(self):
+        get_validation_plan(self.formidable, role='padawan')
+        data = FormidableSerializer(self.formidable).data
+        data['fields'] = [
+            field for field in data['fields'] if field['slug'] != 'email'
+        ]
+        serializer = FormidableSerializer(instance=self.formidable, data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(len(validation_plan_cache), 0)
+
+        plan = get_validation_plan(self.formidable, role='padawan')
+        _, errors = plan.validate({})
+        self.assertNotIn('email', errors)
@@ -1,6 +1,19 @@
 from collections import namedtuple
-from django.test import TestCase
-from formidable.validators import ValidatorFactory, DateValidatorFactory
+from datetime import date
+from decimal import Decimal
+
+from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta
+from freezegun import freeze_time
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from formidable.serializers.validation import RegexpSerializer
+from formidable.validators import (
+    AgeAboveValidator, DateIsInFuture, ValidatorFactory,
+    DateValidatorFactory, compile_regex, get_age, get_today,
+    has_nested_quantifiers, parse_date, produce_validator, reference_date,
+    _parse_iso_date
+)
 try:
     from unittest import mock
 except ImportError:
@@ -13,6 +26,9 @@ class TestValidatorFactoryMapping(TestCase):
             'Validation', ['type', 'message', 'value']
         )
         self.validation_object = ValidatorFactory()
+        # Don't share the validators built by the mocked methods
+        produce_validator.cache_clear()
+        self.addCleanup(produce_validator.cache_clear)
 
     @mock.patch('formidable.validators.ValidatorFactory.min_length')
     def test_min_length(self, mock_object):
@@ -129,6 +145,8 @@ class TestDateValidatorFactoryMapping(TestCase):
             'Validation', ['type', 'message', 'value']
         )
         self.validation_object = DateValidatorFactory()
+        produce_validator.cache_clear()
+        self.addCleanup(produce_validator.cache_clear)
 
     @mock.patch('formidable.validators.DateLTValidator')
     def test_lt(self, mocked_validator):
@@ -173,3 +191,178 @@ class TestDateValidatorFactoryMapping(TestCase):
             )
         )
         assert mocked_validator.called
+
+
+class TestSharedValidators(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        produce_validator.cache_clear()
+        self.addCleanup(produce_validator.cache_clear)
+
+    def test_shared(self):
+        validation = {'type': 'GT', 'value': '2.5', 'message': None}
+        validator = ValidatorFactory().produce(validation)
+        self.assertIs(validator, ValidatorFactory().produce(validation))
+        self.assertEqual(validator.limit_value, Decimal('2.5'))
+        self.assertIsNot(
+            validator, ValidatorFactory().produce(
+                dict(validation, message='Too small')
+            )
+        )
+        self.assertIsNot(validator, DateValidatorFactory().produce(
+            dict(validation, value='2021-01-01')
+        ))
+
+    def test_not_shared(self):
+        class Factory(DateValidatorFactory):
+            pass
+
+        class NotSharedFactory(DateValidatorFactory):
+            share_validators = False
+
+        validation = {'type': 'GT', 'value': '2021-01-01', 'message': None}
+        for factory_class in (Factory, NotSharedFactory):
+            self.assertIsNot(
+                factory_class().produce(validation),
+                factory_class().produce(validation),
+            )
+        self.assertEqual(produce_validator.cache_info().currsize, 0)
+
+    def test_shared_by_subclass(self):
+        class Factory(ValidatorFactory):
+            share_validators = True
+
+        validation = {'type': 'GT', 'value': '2.5', 'message': None}
+        self.assertIs(
+            Factory().produce(validation), Factory().produce(validation)
+        )
+
+    def test_constructor_error(self):
+        # Errors of the validators are not mistaken for unhashable values
+        validation = {'type': 'IS_AGE_ABOVE', 'value': 18, 'message': None}
+        with mock.patch('formidable.validators.AgeAboveValidator',
+                        side_effect=TypeError):
+            with self.assertRaises(TypeError):
+                DateValidatorFactory().produce(validation)
+
+    def test_unhashable_value(self):
+        validation = {'type': 'EQ', 'value': ['a'], 'message': None}
+        validator = ValidatorFactory().produce(validation)
+        self.assertEqual(validator.limit_value, ['a'])
+
+    @mock.patch('formidable.validators.parse', wraps=parse)
+    def test_date_parsed_once(self, mocked_parse):
+        _parse_iso_date.cache_clear()
+        factory = DateValidatorFactory()
+        for type_ in ('GT', 'GTE', 'LT', 'LTE', 'EQ', 'NEQ'):
+            validator = factory.produce({
+                'type': type_, 'value': '2021-01-01', 'message': None,
+            })
+            self.assertEqual(validator.limit_value, date(2021, 1, 1))
+        self.assertEqual(mocked_parse.call_count, 1)
+
+    def test_partial_date(self):
+        validation = {'type': 'GT', 'value': '2021-01', 'message': None}
+        factory = DateValidatorFactory()
+        with freeze_time('2021-03-15'):
+            self.assertEqual(parse_date('2021-01'), date(2021, 1, 15))
+            validator = factory.produce(validation)
+            self.assertEqual(validator.limit_value, date(2021, 1, 15))
+        with freeze_time('2021-03-20'):
+            self.assertEqual(parse_date('2021-01'), date(2021, 1, 20))
+            validator = factory.produce(validation)
+            self.assertEqual(validator.limit_value, date(2021, 1, 20))
+
+
+@freeze_time('2021-03-01')
+class TestReferenceDate(TestCase):
+
+    def test_get_today(self):
+        self.assertEqual(get_today(), date(2021, 3, 1))
+        with reference_date(date(2000, 1, 1)):
+            self.assertEqual(get_today(), date(2000, 1, 1))
+            with reference_date():
+                self.assertEqual(get_today(), date(2021, 3, 1))
+            self.assertEqual(get_today(), date(2000, 1, 1))
+        self.assertEqual(get_today(), date(2021, 3, 1))
+
+    def test_validators(self):
+        validator = AgeAboveValidator(18)
+        with reference_date(date(2018, 6, 1)):
+            validator(date(2000, 6, 1))
+        with reference_date(date(2018, 5, 31)):
+            with self.assertRaises(ValidationError):
+                validator(date(2000, 6, 1))
+
+        validator = DateIsInFuture(True)
+        with reference_date(date(2000, 1, 1)):
+            validator(date(2000, 1, 2))
+        with self.assertRaises(ValidationError):
+            validator(date(2000, 1, 2))
+
+    def test_get_age(self):
+        today = date(2021, 3, 1)
+        birth_dates = [
+            date(2000, 2, 29), date(2000, 3, 1), date(2000, 3, 2),
+            date(2001, 2, 28), date(2020, 12, 31), date(2021, 3, 1),
+            date(2021, 3, 2), date(1970, 1, 1), date(2022, 3, 1),
+            date(2022, 3, 2), date(2024, 2, 29), date(2004, 2, 29),
+            date(2022, 2, 28), date(2021, 2, 28),
+        ]
+        days = (
+            today, date(2024, 2, 28), date(2024, 2, 29), date(2021, 2, 28),
+            date(2022, 2, 28), date(2020, 2, 29), date(2004, 2, 29),
+        )
+        for birth_date in birth_dates:
+            for day in days:
+                with self.subTest(birth_date=birth_date, day=day):
+                    self.assertEqual(
+                        get_age(birth_date, day),
+                        relativedelta(day, birth_date).years
+                    )
+        # Born on Feb 29, birthday on Feb 28 in non-leap years
+        self.assertEqual(get_age(date(2004, 2, 29), date(2022, 2, 28)), 18)
+        self.assertEqual(get_age(date(2004, 2, 29), date(2022, 2, 27)), 17)
+
+
+class TestRegexCache(TestCase):
+
+    def test_compile_regex(self):
+        self.assertIs(compile_regex(r'^\w+$'), compile_regex(r'^\w+$'))
+
+    def test_factory_shares_regex(self):
+        factory = ValidatorFactory()
+        validations = [
+            {'type': 'REGEXP', 'value': r'^[a-z]+$', 'message': None},
+            {'type': 'REGEXP', 'value': r'^[a-z]+$', 'message': 'Letters'},
+        ]
+        first, second = [
+            factory.produce(validation) for validation in validations
+        ]
+        first('abc')
+        second('abc')
+        # The validators wrap the pattern in a lazy object
+        self.assertIs(first.regex._wrapped, compile_regex(r'^[a-z]+$'))
+        self.assertIs(second.regex._wrapped, first.regex._wrapped)
+
+    def test_has_nested_quantifiers(self):
+        for pattern in ('(a+)+', r'(\w*\s?)*', '((ab)*c)+', '(a|b+)*'):
+            with self.subTest(pattern=pattern):
+                self.assertTrue(has_nested_quantifiers(pattern))
+        for pattern in (r'^\w+$', '(a|b)*c', '(a{2})*', r'\d{1,3}(,\d+)?'):
+            with self.subTest(pattern=pattern):
+                self.assertFalse(has_nested_quantifiers(pattern))
+
+    def test_serializer(self):
+        data = {'type': 'REGEXP', 'value': '(a+)+$'}
+        self.assertTrue(RegexpSerializer(data=data).is_valid())
+        with self.settings(FORMIDABLE_CHECK_REGEXP_COMPLEXITY=True):
+            serializer = RegexpSerializer(data=data)
+            self.assertFalse(serializer.is_valid())
+            self.assertIn('backtracking', serializer.errors['value'][0])
+
+    @override_settings(FORMIDABLE_CHECK_REGEXP_COMPLEXITY=True)
+    def test_serializer_invalid(self):
+        serializer = RegexpSerializer(data={'type': 'REGEXP', 'value': '('})
+        self.assertFalse(serializer.is_valid())
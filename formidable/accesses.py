@@ -1,10 +1,34 @@
 """
 .. autofunction:: get_accesses
     members
+
+The ``FORMIDABLE_ACCESS_RIGHTS_LOADER`` is called once per
+:func:`accesses_loaded_once` block, e.g. by :class:`FormidableSerializer`
+once for the validation of a whole form and once for its save, instead of
+once per field or access.
+
+On top of that, the accesses can be kept in memory for
+``FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT`` seconds (``None`` to keep them
+until the process ends). This cache is disabled by default, and is reset
+when the loader setting changes, or explicitly with
+:func:`invalidate_accesses`.
+
+.. autofunction:: accesses_loaded_once
+
+.. autofunction:: get_accesses_ids
+
+.. autofunction:: invalidate_accesses
 """
 import importlib
+import threading
+import time
+from contextlib import contextmanager
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from formidable.utils import ContextVar, import_cached_object
 
 
 class PreviewMode:
@@ -34,26 +58,145 @@ class AccessObject:
                 .format(access=self))
 
 
+class AccessRegistry:
+    """
+    Access objects returned by the ``FORMIDABLE_ACCESS_RIGHTS_LOADER``,
+    cached for ``FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT`` seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = None
+        # Entry loaded in the enclosing loaded_once() block, if any
+        self._block_entry = ContextVar(
+            'formidable_accesses_entry', default=None
+        )
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT', 0)
+
+    def load(self):
+        module, meth_name = settings.FORMIDABLE_ACCESS_RIGHTS_LOADER.rsplit(
+            '.', 1
+        )
+        mod = importlib.import_module(module)
+        meth = getattr(mod, meth_name)
+        res = meth()
+        assert type(res) == list, 'FORMIDABLE_ACCESS_RIGHTS_LOADER has to return a list'  # noqa
+        for access in res:
+            assert type(access) == AccessObject, 'access must be AccessObject'
+        return res, frozenset(access.id for access in res)
+
+    def is_fresh(self, entry):
+        return entry is not None and (
+            entry[0] is None or entry[0] >= time.monotonic()
+        )
+
+    def get_entry(self):
+        block_entry = self._block_entry.get()
+        if block_entry is None:
+            return self.get_cached_entry()
+        if not block_entry:
+            block_entry.append(self.get_cached_entry())
+        return block_entry[0]
+
+    @contextmanager
+    def loaded_once(self):
+        if self._block_entry.get() is not None:
+            yield
+            return
+        token = self._block_entry.set([])
+        try:
+            yield
+        finally:
+            self._block_entry.reset(token)
+
+    def get_cached_entry(self):
+        timeout = self.timeout
+        if timeout == 0:
+            return self.load()
+        entry = self._entry
+        if not self.is_fresh(entry):
+            with self._lock:
+                entry = self._entry
+                if not self.is_fresh(entry):
+                    expires = None
+                    if timeout is not None:
+                        expires = time.monotonic() + timeout
+                    entry = (expires,) + self.load()
+                    self._entry = entry
+        return entry[1:]
+
+    def get_accesses(self):
+        accesses, _ = self.get_entry()
+        return list(accesses)
+
+    def get_ids(self):
+        _, ids = self.get_entry()
+        return ids
+
+    def invalidate(self):
+        with self._lock:
+            self._entry = None
+
+
+access_registry = AccessRegistry()
+
+
 def get_accesses():
     """
     Load the method defined in the settings :attr:`ACCESS_LOADER`, and execute
     it in order to return the result.
     The method checks to ensure it returns a list of Access objects.
+    The result is cached when ``FORMIDABLE_ACCESS_RIGHTS_CACHE_TIMEOUT`` is
+    set.
+    """
+    return access_registry.get_accesses()
+
+
+def get_accesses_ids():
+    """
+    Return the frozenset of the ids of the accesses returned by
+    :func:`get_accesses`.
+    """
+    return access_registry.get_ids()
+
+
+def accesses_loaded_once():
+    """
+    Return a context manager calling the ``FORMIDABLE_ACCESS_RIGHTS_LOADER``
+    at most once in its ``with`` block, whatever the number of calls to
+    :func:`get_accesses` and :func:`get_accesses_ids`:
+
+    .. code-block:: python
+
+        >>> with accesses_loaded_once():
+        ...     serializer.is_valid()
+    """
+    return access_registry.loaded_once()
+
+
+def invalidate_accesses():
+    """
+    Forget the cached accesses, e.g. when the roles returned by the loader
+    change before the timeout expires.
+    """
+    access_registry.invalidate()
+
+
+@receiver(setting_changed)
+def reset_access_registry(setting, **kwargs):
+    if setting.startswith('FORMIDABLE_ACCESS_RIGHTS_'):
+        access_registry.invalidate()
+
+
+def get_context_loader():
+    """
+    Return the function set by ``FORMIDABLE_CONTEXT_LOADER``, imported once.
     """
-    module, meth_name = settings.FORMIDABLE_ACCESS_RIGHTS_LOADER.rsplit(
-        '.', 1
-    )
-    mod = importlib.import_module(module)
-    meth = getattr(mod, meth_name)
-    res = meth()
-    assert type(res) == list, 'FORMIDABLE_ACCESS_RIGHTS_LOADER has to return a list'  # noqa
-    for access in res:
-        assert type(access) == AccessObject, 'access must be AccessObject'
-    return res
+    return import_cached_object(settings.FORMIDABLE_CONTEXT_LOADER)
 
 
 def get_context(request, kwargs):
-    module, meth_name = settings.FORMIDABLE_CONTEXT_LOADER.rsplit('.', 1)
-    mod = importlib.import_module(module)
-    meth = getattr(mod, meth_name)
-    return meth(request, kwargs)
+    return get_context_loader()(request, kwargs)
@@ -4,8 +4,12 @@ Django-formidable app definition.
 The :class:`FormidableConfig` checks various configuration settings:
 
 * post-update and post-create callbacks
+
+It also imports these callbacks and the ``FORMIDABLE_CONTEXT_LOADER`` once,
+instead of on every request.
 """
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class FormidableConfig(AppConfig):
@@ -18,5 +22,8 @@ class FormidableConfig(AppConfig):
         """
         Run various checks when ready
         """
+        from .accesses import get_context_loader
         from .views import check_callback_configuration
         check_callback_configuration()
+        if getattr(settings, 'FORMIDABLE_CONTEXT_LOADER', None):
+            get_context_loader()
@@ -0,0 +1,129 @@
+"""
+Executors of the post-create and post-update callbacks.
+
+By default, the callbacks run synchronously, in the request. When the
+``FORMIDABLE_CALLBACK_EXECUTOR`` setting is set to the path of an executor
+class, the success callbacks are submitted to an instance of this class once
+the transaction saving the form is committed, and the failure callbacks right
+away. The request then returns without waiting for the callbacks, which can't
+alter the response anymore. This is opt-in, the callbacks are synchronous
+unless the setting is set.
+
+The callbacks still receive the request of the view, which is over when they
+run: they should only read its data, which is parsed beforehand, its user,
+auth, query parameters and headers, and must not alter it (e.g. its session
+or messages). See :doc:`callbacks`.
+
+.. code-block:: python
+
+    FORMIDABLE_CALLBACK_EXECUTOR = \\
+        'formidable.callbacks.ThreadPoolCallbackExecutor'
+
+Executors are instantiated without arguments, and only need a ``submit(fn,
+*args)`` method, like the executors of :mod:`concurrent.futures`: a queue
+backend can be plugged by a class submitting the callbacks to its workers.
+
+.. autoclass:: ThreadPoolCallbackExecutor
+
+.. autofunction:: get_callback_executor
+
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+
+from formidable.utils import import_object
+
+logger = logging.getLogger(__name__)
+
+# Executors instantiated by get_callback_executor, indexed by path
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+class ThreadPoolCallbackExecutor:
+    """
+    Run the callbacks in a pool of ``FORMIDABLE_CALLBACK_MAX_WORKERS``
+    threads (4 by default).
+
+    At most ``FORMIDABLE_CALLBACK_QUEUE_SIZE`` callbacks (100 by default) wait
+    for a thread: when the queue is full, the callbacks run synchronously.
+    """
+
+    def __init__(self, max_workers=None, queue_size=None):
+        if max_workers is None:
+            max_workers = getattr(
+                settings, 'FORMIDABLE_CALLBACK_MAX_WORKERS', 4
+            )
+        if queue_size is None:
+            queue_size = getattr(
+                settings, 'FORMIDABLE_CALLBACK_QUEUE_SIZE', 100
+            )
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='formidable-callback'
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + queue_size)
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            logger.warning(
+                'The callbacks queue is full, running %s synchronously', fn
+            )
+            fn(*args)
+            return None
+        try:
+            future = self._executor.submit(self.run, fn, *args)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda future: self._slots.release())
+        return future
+
+    def run(self, fn, *args):
+        # The threads don't handle requests: close their database
+        # connections, as request_started / request_finished would.
+        close_old_connections()
+        try:
+            fn(*args)
+        except Exception:
+            logger.exception('An error has occurred with callback %s', fn)
+        finally:
+            close_old_connections()
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def get_callback_executor():
+    """
+    Return the executor set by ``FORMIDABLE_CALLBACK_EXECUTOR``, or ``None``
+    if the callbacks run synchronously.
+    """
+    path = getattr(settings, 'FORMIDABLE_CALLBACK_EXECUTOR', None)
+    if not path:
+        return None
+    executor = _executors.get(path)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(path)
+            if executor is None:
+                executor = import_object(path)()
+                _executors[path] = executor
+    return executor
+
+
+@receiver(setting_changed)
+def reset_callback_executors(setting, **kwargs):
+    if not setting.startswith('FORMIDABLE_CALLBACK_'):
+        return
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        if hasattr(executor, 'shutdown'):
+            executor.shutdown(wait=False)
@@ -0,0 +1,122 @@
+"""
+Store of pre-rendered ContextForm JSON documents.
+
+Rendering the ContextForm of a form for a given role loads and filters the
+whole form definition. Since forms are rarely modified and roles are a small,
+fixed set, the documents of every role can be rendered once per revision of
+the form, encoded in JSON, and stored in a Django cache. The documents of a
+form are dropped from the store when it's deleted.
+
+The store is disabled by default. Set ``FORMIDABLE_CONTEXT_FORM_CACHE`` to the
+alias of the Django cache to use to enable it.
+
+.. autofunction:: get_context_form
+
+.. autofunction:: build_context_forms
+
+.. autofunction:: delete_context_forms
+
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from rest_framework.renderers import JSONRenderer
+
+from formidable import json_version
+from formidable.accesses import get_accesses
+from formidable.models import Formidable
+from formidable.serializers.forms import ContextFormSerializer
+
+KEY_PREFIX = 'formidable:context-form'
+
+
+def get_store():
+    """
+    Return the Django cache used to store the documents, or ``None`` when the
+    store is disabled.
+    """
+    alias = getattr(settings, 'FORMIDABLE_CONTEXT_FORM_CACHE', None)
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def get_cache_key(formidable, role):
+    return '{}:{}:{}:{}:{}'.format(
+        KEY_PREFIX, json_version, formidable.pk,
+        formidable.get_cache_version(), role,
+    )
+
+
+def render_context_form(formidable, role):
+    """
+    Return the ContextForm of ``formidable`` for ``role``, encoded in JSON.
+    """
+    serializer = ContextFormSerializer(formidable, context={'role': role})
+    return JSONRenderer().render(serializer.data)
+
+
+def build_context_forms(formidable, store=None):
+    """
+    Render the ContextForm documents of ``formidable`` for every role
+    returned by the ``FORMIDABLE_ACCESS_RIGHTS_LOADER``, and save them in the
+    store.
+
+    Return a dict of the encoded documents, indexed by role.
+    """
+    store = store or get_store()
+    documents = {
+        access.id: render_context_form(formidable, access.id)
+        for access in get_accesses()
+    }
+    if store is not None:
+        timeout = getattr(
+            settings, 'FORMIDABLE_CONTEXT_FORM_CACHE_TIMEOUT', None
+        )
+        store.set_many(
+            {
+                get_cache_key(formidable, role): document
+                for role, document in documents.items()
+            },
+            timeout=timeout,
+        )
+    return documents
+
+
+def get_context_form(formidable, role):
+    """
+    Return the ContextForm of ``formidable`` for ``role``, encoded in JSON.
+
+    The document is read from the store; on a miss, the documents of every
+    role are built and saved for the current revision of the form.
+    Return ``None`` when the store is disabled.
+    """
+    store = get_store()
+    if store is None:
+        return None
+    document = store.get(get_cache_key(formidable, role))
+    if document is None:
+        document = build_context_forms(formidable, store).get(role)
+    if document is None:
+        # Role unknown to the access loader, not worth storing
+        document = render_context_form(formidable, role)
+    return document
+
+
+def delete_context_forms(formidable, store=None):
+    """
+    Drop the documents of the current version of ``formidable`` from the
+    store.
+    """
+    store = store or get_store()
+    if store is not None:
+        store.delete_many([
+            get_cache_key(formidable, access.id) for access in get_accesses()
+        ])
+
+
+@receiver(post_delete, sender=Formidable)
+def delete_deleted_form_context_forms(sender, instance, **kwargs):
+    delete_context_forms(instance)
@@ -9,13 +9,28 @@ its corresponding django form class.
 from collections import OrderedDict
 
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db.models import Prefetch
+from django.forms.utils import ErrorDict
 
 from formidable.forms import field_builder
-from formidable.forms.conditions import conditions_register
+from formidable.forms.cache import (
+    form_class_cache, get_schema_cache_key, schema_form_class_cache,
+    validation_plan_cache
+)
+from formidable.forms.conditions import ConditionsIndex, conditions_register
 from formidable.models import Access, Formidable, Item
 
 
+def skip_hidden_fields():
+    """
+    Return ``True`` if the fields hidden by the display conditions are not
+    cleaned, see ``FORMIDABLE_SKIP_HIDDEN_FIELDS``.
+    """
+    return getattr(settings, 'FORMIDABLE_SKIP_HIDDEN_FIELDS', False)
+
+
 class FormidableBoundFieldCache(dict):
     """
     In Django 1.8, bound fields are handled in the form context (__getitem__).
@@ -45,30 +60,79 @@ class BaseDynamicForm(forms.Form):
         super().__init__(*args, **kwargs)
         self._bound_fields_cache = FormidableBoundFieldCache()
 
+    def get_conditions_index(self):
+        index = getattr(self, '_conditions_index', None)
+        if index is None:
+            index = ConditionsIndex(self._conditions)
+        return index
+
     def get_removed_fields(self, cleaned_data):
         """
         Build the list of fields to be removed due to conditional displays
         """
-        # build a catalog of fields **targeted** by the conditions
-        condition_targets = {}
-
-        # For each condition, extract its status (should I display or not)
-        for condition in self._conditions:
-            # should we keep these fields?
-            keep_fields = condition.keep_fields(cleaned_data)
-            for field_id in condition.fields_ids:
-                # Fill the catalog
-                if field_id not in condition_targets:
-                    condition_targets[field_id] = []
-                condition_targets[field_id].append(keep_fields)
-        # Here, the catalog contains fields targeted by 1 or many conditions.
-
-        # If only one condition says "please display X", we'll keep X
-        # That's why we gather the conditions using "any"
-        condition_targets = {k: any(v) for k, v in condition_targets.items()}
-        # We'll only remove fields that are targeted by conditions **and**
-        # those conditions are false
-        return (k for k, v in condition_targets.items() if not v)
+        return self.get_conditions_index().get_removed_fields(cleaned_data)
+
+    def can_skip_hidden_fields(self):
+        """
+        Return ``True`` if the fields hidden by the conditions can be found
+        out before cleaning the fields, out of the fields tested by the
+        conditions.
+        """
+        if not skip_hidden_fields():
+            return False
+        if type(self).get_removed_fields is not \
+                BaseDynamicForm.get_removed_fields:
+            return False
+        return self.get_conditions_index().complete
+
+    def _clean_fields(self):
+        if not self.can_skip_hidden_fields():
+            return super()._clean_fields()
+
+        # Clean the fields tested by the conditions first, to find out the
+        # hidden fields, which don't need to be cleaned.
+        tested = self.get_conditions_index().tests_by_field
+        for name in self.fields:
+            if name in tested:
+                self._clean_field(name)
+        hidden = set(self.get_removed_fields(self.cleaned_data))
+        for name in self.fields:
+            if name not in tested and name not in hidden:
+                self._clean_field(name)
+
+        # Keep the cleaned data and errors in the order of the fields
+        self.cleaned_data = {
+            name: self.cleaned_data[name]
+            for name in self.fields if name in self.cleaned_data
+        }
+        self._errors = ErrorDict(
+            (name, self._errors[name])
+            for name in self.fields if name in self._errors
+        )
+
+    def _clean_field(self, name):
+        """
+        Clean a single field, as ``django.forms.Form._clean_fields`` does.
+        """
+        field = self.fields[name]
+        if field.disabled:
+            value = self.get_initial_for_field(field, name)
+        else:
+            value = field.widget.value_from_datadict(
+                self.data, self.files, self.add_prefix(name)
+            )
+        try:
+            if isinstance(field, forms.FileField):
+                initial = self.get_initial_for_field(field, name)
+                value = field.clean(value, initial)
+            else:
+                value = field.clean(value)
+            self.cleaned_data[name] = value
+            if hasattr(self, 'clean_%s' % name):
+                value = getattr(self, 'clean_%s' % name)()
+                self.cleaned_data[name] = value
+        except ValidationError as e:
+            self.add_error(name, e)
 
     def clean(self):
         cleaned_data = super().clean()
@@ -90,9 +154,28 @@ def get_dynamic_form_class_from_schema(schema, field_factory=None):
     """
     Return a dynamically generated and contextualized form class
 
+    When the schema form class cache is enabled (see
+    :mod:`formidable.forms.cache`), the class generated out of a schema is
+    returned as is by the next calls with an equal schema and field factory.
+
     """
-    attrs = OrderedDict()
     field_factory = field_factory or field_builder.FormFieldFactory()
+    cache_key = None
+    if schema_form_class_cache.enabled:
+        cache_key = get_schema_cache_key(schema, field_factory)
+        if cache_key is not None:
+            form_class = schema_form_class_cache.get(cache_key)
+            if form_class is not None:
+                return form_class
+
+    form_class = _build_form_class_from_schema(schema, field_factory)
+    if cache_key is not None:
+        schema_form_class_cache.set(cache_key, form_class)
+    return form_class
+
+
+def _build_form_class_from_schema(schema, field_factory):
+    attrs = OrderedDict()
     doc = schema['description']
     for field in schema['fields']:
         try:
@@ -107,12 +190,55 @@ def get_dynamic_form_class_from_schema(schema, field_factory=None):
         attrs,
         conditions
     )
+    attrs['_conditions_index'] = ConditionsIndex(attrs['_conditions'])
     form_class = type(str('DynamicForm'), (BaseDynamicForm,), attrs)
     form_class.__doc__ = doc
     return form_class
 
 
-def get_dynamic_form_class(formidable, role=None, field_factory=None):
+def contextualize_schema(schema, role=None):
+    """
+    Return the schema of the form class of a Formidable JSON ``schema``, for
+    the given ``role``.
+    """
+    from formidable.serializers.fields import field_register
+    from formidable.serializers.forms import contextualize
+
+    schema = contextualize(schema, role)
+    # Config fields are flattened in the Formidable JSON, they are stored
+    # as the parameters of the fields in the database.
+    for field in schema['fields']:
+        if 'parameters' in field:
+            continue
+        serializer_class = field_register.get(field['type_id'])
+        meta = getattr(serializer_class, 'Meta', object)
+        config_fields = getattr(meta, 'config_fields', [])
+        if config_fields:
+            field['parameters'] = {
+                name: field.get(name) for name in config_fields
+            }
+    return schema
+
+
+def get_dynamic_form_class_from_snapshot(formidable, role=None,
+                                         field_factory=None):
+    """
+    Return the form class of a formidable object built out of its schema
+    snapshot, i.e. without loading its fields from the database.
+
+    Raise a ``ValueError`` if the formidable object has no valid snapshot.
+    """
+    snapshot = formidable.get_schema_snapshot()
+    if snapshot is None:
+        raise ValueError(
+            'Formidable {} has no schema snapshot'.format(formidable.pk)
+        )
+    schema = contextualize_schema(snapshot, role)
+    return get_dynamic_form_class_from_schema(schema, field_factory)
+
+
+def get_dynamic_form_class(formidable, role=None, field_factory=None,
+                           from_snapshot=False):
     """
     This is the main method for getting a django form class from a formidable
     object.
@@ -132,11 +258,38 @@ def get_dynamic_form_class(formidable, role=None, field_factory=None):
         form_obj = Formidable.objects.get(pk=42)
         django_form_class = get_dynamic_form_class(form_obj, role='jedi')
 
+    If ``from_snapshot`` is set and the formidable object has a valid schema
+    snapshot, the form class is built out of this snapshot instead of loading
+    the fields from the database.
+
+    When the form class cache is enabled (see
+    :mod:`formidable.forms.cache`), the generated class is stored and
+    returned as is by the next calls with the same arguments, as long as the
+    revision of the formidable object doesn't change.
+
     """
 
     attrs = OrderedDict()
     field_factory = field_factory or field_builder.FormFieldFactory()
 
+    cache_key = None
+    if form_class_cache.enabled and formidable.pk is not None:
+        cache_key = (
+            formidable.pk, role, formidable.revision,
+            field_factory.get_cache_key(),
+        )
+        form_class = form_class_cache.get(cache_key)
+        if form_class is not None:
+            return form_class
+
+    if from_snapshot and formidable.get_schema_snapshot() is not None:
+        form_class = get_dynamic_form_class_from_snapshot(
+            formidable, role, field_factory
+        )
+        if cache_key is not None:
+            form_class_cache.set(cache_key, form_class)
+        return form_class
+
     access_qs = Access.objects.all()
     if role:
         access_qs = access_qs.filter(access_id=role)
@@ -157,7 +310,11 @@ def get_dynamic_form_class(formidable, role=None, field_factory=None):
 
     conditions_json = formidable.conditions or []
     attrs['_conditions'] = conditions_register.build(attrs, conditions_json)
-    return type(str('DynamicForm'), (BaseDynamicForm,), attrs)
+    attrs['_conditions_index'] = ConditionsIndex(attrs['_conditions'])
+    form_class = type(str('DynamicForm'), (BaseDynamicForm,), attrs)
+    if cache_key is not None:
+        form_class_cache.set(cache_key, form_class)
+    return form_class
 
 
 class FormidableForm(forms.Form):
@@ -189,6 +346,11 @@ class FormidableForm(forms.Form):
             field.to_formidable(form, order, slug)
             order += 1
 
+        if instance:
+            form.bump_revision()
+        form.refresh_schema_snapshot()
+        form_class_cache.invalidate(form.pk)
+        validation_plan_cache.invalidate(form.pk)
         return form
 
     @classmethod
@@ -0,0 +1,146 @@
+"""
+Process-wide cache of generated django form classes.
+
+Building a form class out of a :class:`formidable.models.Formidable` object
+hits the database several times and instantiates every field, widget and
+validator of the form. Since forms are rarely modified, the generated classes
+can be kept and reused for subsequent calls.
+
+The cache is disabled by default. Set ``FORMIDABLE_FORM_CLASS_CACHE_SIZE`` to
+the maximum number of form classes to keep in memory to enable it.
+
+The validation plans compiled out of these classes (see
+:mod:`formidable.forms.validations.plan`) are kept in a similar cache, whose
+size is set by ``FORMIDABLE_VALIDATION_PLAN_CACHE_SIZE``. Since plans are
+only built by the features opting in to them, this cache is enabled by
+default and keeps up to 128 plans.
+
+The classes and plans of a form are dropped when it's created or deleted,
+since its primary key may have been used by another form.
+
+The form classes built out of JSON schemas by
+:func:`formidable.forms.get_dynamic_form_class_from_schema` are kept in a
+third cache, keyed by a hash of the schema content, whose size is set by
+``FORMIDABLE_SCHEMA_FORM_CLASS_CACHE_SIZE``.
+
+.. autoclass:: FormClassCache
+    :members:
+
+.. autofunction:: get_schema_cache_key
+
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+class FormClassCache:
+    """
+    Thread-safe LRU store of generated form classes.
+
+    The size of the cache is read from the settings key ``setting_name``,
+    ``default_size`` when it isn't set. A size of ``0`` (the default)
+    disables the cache.
+    Keys are tuples, whose first item identifies the form the class has been
+    built from, e.g. the primary key of a
+    :class:`formidable.models.Formidable` object.
+    """
+
+    def __init__(self, setting_name, default_size=0):
+        self.setting_name = setting_name
+        self.default_size = default_size
+        self._store = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self):
+        return getattr(settings, self.setting_name, self.default_size) or 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key):
+        """
+        Return the form class stored for ``key``, or ``None``.
+        """
+        with self._lock:
+            try:
+                form_class = self._store[key]
+            except KeyError:
+                return None
+            self._store.move_to_end(key)
+            return form_class
+
+    def set(self, key, form_class):
+        """
+        Store ``form_class``, evicting the least recently used classes when
+        the cache is full.
+        """
+        maxsize = self.maxsize
+        if maxsize <= 0:
+            return
+        with self._lock:
+            self._store[key] = form_class
+            self._store.move_to_end(key)
+            while len(self._store) > maxsize:
+                self._store.popitem(last=False)
+
+    def invalidate(self, pk):
+        """
+        Drop every form class built from the form ``pk``.
+        """
+        with self._lock:
+            for key in [key for key in self._store if key[0] == pk]:
+                del self._store[key]
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def __len__(self):
+        return len(self._store)
+
+
+def get_schema_cache_key(schema, field_factory):
+    """
+    Return the cache key of the form class or validation plan built out of
+    ``schema`` by ``field_factory``, or ``None`` if the schema can't be
+    hashed.
+
+    The schema is hashed out of its canonical JSON (sorted keys, no
+    whitespaces), so equal schemas get the same key whatever the order of
+    their keys.
+    """
+    try:
+        content = json.dumps(schema, sort_keys=True, separators=(',', ':'))
+        cache_key = (
+            hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            field_factory.get_cache_key(),
+        )
+        hash(cache_key)
+    except (TypeError, ValueError):
+        return None
+    return cache_key
+
+
+form_class_cache = FormClassCache('FORMIDABLE_FORM_CLASS_CACHE_SIZE')
+validation_plan_cache = FormClassCache(
+    'FORMIDABLE_VALIDATION_PLAN_CACHE_SIZE', default_size=128
+)
+schema_form_class_cache = FormClassCache(
+    'FORMIDABLE_SCHEMA_FORM_CLASS_CACHE_SIZE'
+)
+
+
+@receiver(post_save, sender='formidable.Formidable')
+@receiver(post_delete, sender='formidable.Formidable')
+def invalidate_form(sender, instance, created=True, **kwargs):
+    if created:
+        form_class_cache.invalidate(instance.pk)
+        validation_plan_cache.invalidate(instance.pk)
@@ -16,7 +16,98 @@ This can be used in the following situations:
 .. autoclass:: ConditionTest
    :members: mapper
 
+.. autoclass:: ConditionsIndex
+   :members: get_removed_fields
+
+By default, conditions are evaluated independently: a field hidden by a
+condition can still display other fields through the conditions testing it.
+When the ``FORMIDABLE_CONDITIONS_CASCADE`` setting is set, the conditions are
+evaluated in a single pass, in the topological order of their dependencies,
+and the tests of hidden fields always fail, so hiding a field also hides the
+fields it displays. Conditions depending on each other are then rejected by
+the :class:`formidable.serializers.FormidableSerializer`.
+
+.. autofunction:: get_evaluation_order
+
 """
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.functional import cached_property
+
+
+def cascade_conditions():
+    return getattr(settings, 'FORMIDABLE_CONDITIONS_CASCADE', False)
+
+
+class ConditionsCycleError(ValueError):
+    """
+    Raised when conditions depend on each other.
+    """
+
+    def __init__(self, positions):
+        self.positions = positions
+        super().__init__(
+            'Conditions {} depend on each other'.format(positions)
+        )
+
+
+def get_evaluation_order(targets, tested, strict=True):
+    """
+    Return the positions of the conditions in the order they have to be
+    evaluated, so that a condition is evaluated after the conditions
+    targeting the fields it tests. ``targets`` and ``tested`` are the lists
+    of the fields targeted and tested by each condition.
+
+    Raise :class:`ConditionsCycleError` if conditions depend on each other,
+    or append them in their original order if ``strict`` is ``False``.
+    """
+    targeting = defaultdict(list)
+    for position, fields_ids in enumerate(targets):
+        for field_id in fields_ids:
+            targeting[field_id].append(position)
+
+    dependents = defaultdict(list)
+    pending = []
+    for position, fields_ids in enumerate(tested):
+        dependencies = {
+            dependency for field_id in fields_ids
+            for dependency in targeting.get(field_id, ())
+        }
+        pending.append(len(dependencies))
+        for dependency in dependencies:
+            dependents[dependency].append(position)
+
+    # Keep the original order of independent conditions
+    ready = [position for position, count in enumerate(pending) if not count]
+    order = []
+    while ready:
+        position = heapq.heappop(ready)
+        order.append(position)
+        for dependent in dependents[position]:
+            pending[dependent] -= 1
+            if not pending[dependent]:
+                heapq.heappush(ready, dependent)
+
+    if len(order) < len(pending):
+        remaining = [
+            position for position, count in enumerate(pending) if count
+        ]
+        if strict:
+            # Only report the conditions of the cycles, not the ones which
+            # merely depend on them.
+            cycles = set(remaining)
+            pruned = True
+            while pruned:
+                pruned = False
+                for position in sorted(cycles):
+                    if not cycles.intersection(dependents[position]):
+                        cycles.discard(position)
+                        pruned = True
+            raise ConditionsCycleError(sorted(cycles))
+        order.extend(remaining)
+    return order
 
 
 class ConditionsRegister(dict):
@@ -176,3 +267,155 @@ class DisplayIffCondition(Condition):
             fields=self.fields_ids,
             tests=self.tests,
             name=self.name)
+
+
+class IndexedTest:
+    """
+    Compiled ``eq`` :class:`ConditionTest`, matching the values of multiple
+    fields against the set of the values of the test.
+    """
+
+    __slots__ = ('values', 'value_set')
+
+    def __init__(self, values):
+        self.values = values
+        try:
+            self.value_set = frozenset(values)
+        except TypeError:
+            self.value_set = None
+
+    def __call__(self, ref_value):
+        if not self.values:
+            return False
+        if isinstance(ref_value, list) and self.value_set is not None:
+            try:
+                if not self.value_set.isdisjoint(ref_value):
+                    return True
+            except TypeError:
+                return operator_eq(ref_value, self.values)
+            return ref_value == self.values[0]
+        return operator_eq(ref_value, self.values)
+
+
+def is_indexable(condition):
+    if type(condition).keep_fields is not DisplayIffCondition.keep_fields:
+        return False
+    return all(
+        type(test) is ConditionTest
+        and test.mapper.get(test.operator) is operator_eq
+        for test in condition.tests
+    )
+
+
+class ConditionsIndex:
+    """
+    Conditions of a form compiled into an index from the tested fields to
+    their tests, so that evaluating the conditions only costs the tests of
+    the fields present in the cleaned data.
+
+    :class:`DisplayIffCondition` conditions using the ``eq`` operator are
+    indexed, other conditions are evaluated through their ``keep_fields``
+    method.
+    """
+
+    def __init__(self, conditions):
+        self.conditions = list(conditions)
+        # Field ids targeted by the conditions, in order
+        self.targets = []
+        # Fields kept by the conditions without tests
+        self.always_kept = set()
+        # Tested field id => [(condition position, test)]
+        self.tests_by_field = defaultdict(list)
+        # Condition position => (number of tests, targeted field ids)
+        self.indexed = {}
+        self.others = []
+
+        seen = set()
+        for position, condition in enumerate(conditions):
+            for field_id in condition.fields_ids:
+                if field_id not in seen:
+                    seen.add(field_id)
+                    self.targets.append(field_id)
+            if not is_indexable(condition):
+                self.others.append(condition)
+            elif not condition.tests:
+                self.always_kept.update(condition.fields_ids)
+            else:
+                self.indexed[position] = (
+                    len(condition.tests), condition.fields_ids
+                )
+                for test in condition.tests:
+                    self.tests_by_field[test.field_id].append(
+                        (position, IndexedTest(test.values))
+                    )
+        self.tests_by_field = dict(self.tests_by_field)
+
+    @property
+    def complete(self):
+        """
+        ``True`` if every condition is indexed, i.e. if the removed fields
+        only depend on the values of the tested fields.
+        """
+        return not self.others
+
+    @cached_property
+    def cascade_order(self):
+        return get_evaluation_order(
+            [condition.fields_ids for condition in self.conditions],
+            [
+                [test.field_id for test in condition.tests]
+                for condition in self.conditions
+            ],
+            # Forms saved without cascading conditions may have cycles
+            strict=False,
+        )
+
+    def get_removed_fields(self, cleaned_data):
+        """
+        Return the ids of the fields targeted by conditions, and hidden by
+        all of them given the ``cleaned_data`` of a form.
+        """
+        if not self.targets:
+            return []
+        if cascade_conditions():
+            return self.get_cascaded_removed_fields(cleaned_data)
+        kept = set(self.always_kept)
+        passed = defaultdict(int)
+        if len(cleaned_data) < len(self.tests_by_field):
+            tested = [
+                field_id for field_id in cleaned_data
+                if field_id in self.tests_by_field
+            ]
+        else:
+            tested = [
+                field_id for field_id in self.tests_by_field
+                if field_id in cleaned_data
+            ]
+        for field_id in tested:
+            ref_value = cleaned_data[field_id]
+            for position, test in self.tests_by_field[field_id]:
+                if test(ref_value):
+                    passed[position] += 1
+        for position, count in passed.items():
+            size, fields_ids = self.indexed[position]
+            if count == size:
+                kept.update(fields_ids)
+        for condition in self.others:
+            if condition.keep_fields(cleaned_data):
+                kept.update(condition.fields_ids)
+        return [field_id for field_id in self.targets if field_id not in kept]
+
+    def get_cascaded_removed_fields(self, cleaned_data):
+        data = dict(cleaned_data)
+        targets = set(self.targets)
+        kept = set()
+        for position in self.cascade_order:
+            condition = self.conditions[position]
+            # Every condition targeting the tested fields has already been
+            # evaluated: drop the hidden ones, their tests fail.
+            for test in condition.tests:
+                if test.field_id in targets and test.field_id not in kept:
+                    data.pop(test.field_id, None)
+            if condition.keep_fields(data):
+                kept.update(condition.fields_ids)
+        return [field_id for field_id in self.targets if field_id not in kept]
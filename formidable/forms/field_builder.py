@@ -313,6 +313,13 @@ class FormFieldFactory:
         builder = self.map[type_id](field)
         return builder.build(role)
 
+    def get_cache_key(self):
+        """
+        Return a hashable value identifying the form classes produced by
+        this factory, used as part of the form class cache keys.
+        """
+        return type(self), tuple(sorted(self.map.items()))
+
     def get_type_id(self, field):
         if isinstance(field, dict):
             return field['type_id']
@@ -50,7 +50,7 @@ your own fields, please look at :mod:`formidable.forms.widgets`.
 
 from django.forms import fields
 
-from formidable.accesses import get_accesses
+from formidable.accesses import get_accesses, get_accesses_ids
 from formidable.constants import EDITABLE
 from formidable.exceptions import UnknownAccess
 from formidable.forms import boundfield, widgets
@@ -111,7 +111,7 @@ class Field:
         return accesses
 
     def check_accesses(self):
-        accesses_id = [access.id for access in get_accesses()]
+        accesses_id = get_accesses_ids()
         for access in self.accesses.keys():
             if access not in accesses_id:
                 raise UnknownAccess(access)
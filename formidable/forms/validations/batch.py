@@ -0,0 +1,88 @@
+"""
+Validation of many data dicts against a single form.
+
+:func:`validate_batch` builds the validation plan of the form once (see
+:mod:`formidable.forms.validations.plan`), then streams the data dicts
+through it, e.g. to validate the submissions imported from a CSV export:
+
+.. code-block:: python
+
+    >>> from formidable.forms.validations.batch import validate_batch
+    >>> for errors in validate_batch(formidable, rows, role='jedi'):
+    ...     print(errors)
+
+For large, CPU-bound datasets, the rows can be validated by chunks in a pool
+of processes. Each worker builds the plan once, out of the Formidable JSON of
+the form sent by the parent process, so the workers don't access the
+database. The workers are started with the ``FORMIDABLE_PROCESS_START_METHOD``
+start method, by default the one of the platform (see
+:func:`formidable.utils.map_chunks`).
+
+Every row of a batch is validated against the same reference date (see
+:func:`formidable.validators.reference_date`), the current date when the
+validation starts unless ``today`` is given.
+
+.. autofunction:: validate_batch
+
+"""
+from functools import partial
+
+from formidable.forms import (
+    contextualize_schema, field_builder, get_dynamic_form_class_from_schema
+)
+from formidable.forms.validations.plan import (
+    ValidationPlan, get_validation_plan
+)
+from formidable.utils import map_chunks
+from formidable.validators import get_today, reference_date
+
+# Validation plan of the form, in the worker processes of a pool
+_worker_plan = None
+
+
+def _init_worker(schema, field_factory):
+    global _worker_plan
+    _worker_plan = ValidationPlan(
+        get_dynamic_form_class_from_schema(schema, field_factory)
+    )
+
+
+def _validate_chunk(rows, today):
+    with reference_date(today):
+        return [_worker_plan.validate(data)[1] for data in rows]
+
+
+def validate_batch(formidable, rows, role=None, field_factory=None,
+                   processes=None, chunksize=500, today=None):
+    """
+    Validate each data dict of the iterable ``rows`` against the form, and
+    yield their errors in the same order, as dicts mapping the field names
+    to their list of error messages (empty for valid rows).
+
+    The ``role`` and ``field_factory`` arguments are the ones of
+    :func:`formidable.forms.get_dynamic_form_class`.
+
+    When ``processes`` is set, the rows are validated by chunks of
+    ``chunksize`` rows in a pool of ``processes`` worker processes.
+
+    The date validators compare the values with ``today``, by default the
+    current date when the first row is validated.
+    """
+    today = today or get_today()
+    if not processes:
+        plan = get_validation_plan(formidable, role, field_factory)
+        for data in rows:
+            # Don't leak the reference date to the consumer of the generator
+            with reference_date(today):
+                errors = plan.validate(data)[1]
+            yield errors
+        return
+
+    schema = contextualize_schema(
+        formidable.to_json(from_snapshot=True), role
+    )
+    field_factory = field_factory or field_builder.FormFieldFactory()
+    yield from map_chunks(
+        partial(_validate_chunk, today=today), rows, chunksize, processes,
+        initializer=_init_worker, initargs=(schema, field_factory),
+    )
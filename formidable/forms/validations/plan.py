@@ -0,0 +1,234 @@
+"""
+Validation of form data without instantiating django forms.
+
+Validating data with a django form instantiates the form, which deep-copies
+every field and widget of its class, then cleans the data through bound
+fields and error lists. A :class:`ValidationPlan` is compiled once out of a
+form class generated by :func:`formidable.forms.get_dynamic_form_class`: it
+keeps, for each field, the functions reading and cleaning its value, along
+with the conditions of the form. Data dicts are then validated directly, with
+the same cleaned data and errors as the form.
+
+Compiling a plan builds the form class, with all its fields and widgets, so
+compiled plans are kept in a process-wide LRU cache: validating data against
+a cached plan neither hits the database nor builds any field. The cache keeps
+up to 128 plans by default, set ``FORMIDABLE_VALIDATION_PLAN_CACHE_SIZE`` to
+change its size, or to ``0`` to disable it.
+
+Form classes which can't be compiled, i.e. defining their own cleaning
+methods (see :func:`is_compilable`), get a plan validating the data with a
+form instance, as a regular django form does.
+
+.. autoclass:: ValidationPlan
+    :members: validate
+
+.. autofunction:: get_validation_plan
+
+.. autofunction:: get_validation_plan_from_schema
+
+.. autofunction:: is_compilable
+
+"""
+from django.core.exceptions import ValidationError
+from django.forms import FileField
+
+from formidable.forms import (
+    BaseDynamicForm, field_builder, get_dynamic_form_class,
+    get_dynamic_form_class_from_schema, skip_hidden_fields
+)
+from formidable.forms.cache import get_schema_cache_key, validation_plan_cache
+from formidable.forms.conditions import ConditionsIndex
+
+# Methods involved in the validation of a BaseDynamicForm
+FORM_CLEAN_METHODS = (
+    'full_clean', '_clean_fields', '_clean_field', '_clean_form',
+    '_post_clean', 'clean', 'get_conditions_index', 'get_removed_fields',
+    'can_skip_hidden_fields',
+)
+
+
+def is_compilable(form_class):
+    """
+    Return ``True`` if ``form_class`` validates its data the way
+    :class:`formidable.forms.BaseDynamicForm` does.
+    """
+    if not issubclass(form_class, BaseDynamicForm):
+        return False
+    for name in FORM_CLEAN_METHODS:
+        if getattr(form_class, name) is not getattr(BaseDynamicForm, name):
+            return False
+    return not any(
+        hasattr(form_class, 'clean_{}'.format(name))
+        for name in form_class.base_fields
+    )
+
+
+class CompiledField:
+    """
+    Read and clean the value of a field, the way a django form does.
+    """
+
+    __slots__ = (
+        'name', 'disabled', 'initial', 'is_file', 'value_from_datadict',
+        '_clean',
+    )
+
+    def __init__(self, name, field):
+        self.name = name
+        self.disabled = field.disabled
+        self.initial = field.initial
+        self.is_file = isinstance(field, FileField)
+        self.value_from_datadict = field.widget.value_from_datadict
+        self._clean = field.clean
+
+    def get_initial(self):
+        if callable(self.initial):
+            return self.initial()
+        return self.initial
+
+    def clean(self, data, files):
+        if self.disabled:
+            value = self.get_initial()
+        else:
+            value = self.value_from_datadict(data, files, self.name)
+        if self.is_file:
+            return self._clean(value, self.get_initial())
+        return self._clean(value)
+
+
+class ValidationPlan:
+    """
+    Validation of data compiled out of a generated form class.
+
+    Form classes defining their own cleaning methods can't be compiled, their
+    plan validates data using a form instance.
+    """
+
+    def __init__(self, form_class):
+        self.form_class = form_class
+        self.compiled = is_compilable(form_class)
+        self.fields = [
+            CompiledField(name, field)
+            for name, field in form_class.base_fields.items()
+        ]
+        self.conditions_index = getattr(form_class, '_conditions_index', None)
+        if self.conditions_index is None:
+            self.conditions_index = ConditionsIndex(
+                getattr(form_class, '_conditions', [])
+            )
+        tested = self.conditions_index.tests_by_field
+        self.tested_fields = [
+            field for field in self.fields if field.name in tested
+        ]
+
+    def validate(self, data, files=None):
+        """
+        Return the cleaned data and the errors of ``data``, as a dict
+        mapping the field names to their list of error messages.
+        """
+        if not self.compiled:
+            form = self.form_class(data=data, files=files)
+            form.is_valid()
+            errors = {
+                name: list(messages) for name, messages in form.errors.items()
+            }
+            return form.cleaned_data, errors
+
+        files = files or {}
+        cleaned_data = {}
+        errors = {}
+        if skip_hidden_fields() and self.conditions_index.complete:
+            # Clean the fields tested by the conditions first, to find out
+            # the hidden fields, which don't need to be cleaned.
+            self.clean_fields(
+                self.tested_fields, data, files, cleaned_data, errors
+            )
+            skipped = set(
+                self.conditions_index.get_removed_fields(cleaned_data)
+            )
+            skipped.update(self.conditions_index.tests_by_field)
+            self.clean_fields(
+                [field for field in self.fields if field.name not in skipped],
+                data, files, cleaned_data, errors
+            )
+            # Keep the cleaned data and errors in the order of the fields
+            cleaned_data = {
+                field.name: cleaned_data[field.name]
+                for field in self.fields if field.name in cleaned_data
+            }
+            errors = {
+                field.name: errors[field.name]
+                for field in self.fields if field.name in errors
+            }
+        else:
+            self.clean_fields(self.fields, data, files, cleaned_data, errors)
+
+        removed_fields = self.conditions_index.get_removed_fields(cleaned_data)
+        for field_id in removed_fields:
+            cleaned_data.pop(field_id, None)
+            errors.pop(field_id, None)
+        return cleaned_data, errors
+
+    def clean_fields(self, fields, data, files, cleaned_data, errors):
+        for field in fields:
+            try:
+                cleaned_data[field.name] = field.clean(data, files)
+            except ValidationError as e:
+                errors[field.name] = e.messages
+
+
+def get_validation_plan(formidable, role=None, field_factory=None,
+                        from_snapshot=False):
+    """
+    Return the validation plan of the form class returned by
+    :func:`formidable.forms.get_dynamic_form_class` for these arguments.
+
+    When the validation plan cache is enabled, the plan is stored and
+    returned as is by the next calls with the same arguments, as long as the
+    revision of the formidable object doesn't change.
+    """
+    field_factory = field_factory or field_builder.FormFieldFactory()
+
+    cache_key = None
+    if validation_plan_cache.enabled and formidable.pk is not None:
+        cache_key = (
+            formidable.pk, role, formidable.revision,
+            field_factory.get_cache_key(),
+        )
+        plan = validation_plan_cache.get(cache_key)
+        if plan is not None:
+            return plan
+
+    plan = ValidationPlan(get_dynamic_form_class(
+        formidable, role, field_factory, from_snapshot=from_snapshot
+    ))
+    if cache_key is not None:
+        validation_plan_cache.set(cache_key, plan)
+    return plan
+
+
+def get_validation_plan_from_schema(schema, field_factory=None):
+    """
+    Return the validation plan of the form class returned by
+    :func:`formidable.forms.get_dynamic_form_class_from_schema` for these
+    arguments.
+
+    When the validation plan cache is enabled, the plan is stored and
+    returned as is by the next calls with an equal schema and field factory.
+    """
+    field_factory = field_factory or field_builder.FormFieldFactory()
+
+    cache_key = None
+    if validation_plan_cache.enabled:
+        cache_key = get_schema_cache_key(schema, field_factory)
+        if cache_key is not None:
+            plan = validation_plan_cache.get(cache_key)
+            if plan is not None:
+                return plan
+
+    plan = ValidationPlan(
+        get_dynamic_form_class_from_schema(schema, field_factory)
+    )
+    if cache_key is not None:
+        validation_plan_cache.set(cache_key, plan)
+    return plan
@@ -1,5 +1,6 @@
 import os
 import sys
+from functools import lru_cache
 from glob import glob
 from importlib import import_module
 
@@ -10,23 +11,41 @@ HERE = os.path.dirname(__file__)
 package = sys.modules[__name__].__name__
 
 
-def _get_migrations():
+@lru_cache(maxsize=None)
+def _load_migrations(here, package):
     """
-    Return a generator with all JSON migrations sorted.
+    Return the tuple of the JSON migrations modules found in ``here``, sorted
+    by version. The directory is only scanned once.
 
     Each item is a tuple with:
       - the version number (int)
       - the label of the migration
-      - the reference to the migrate() function
+      - the migration module
 
     """
-    for module in sorted(glob(os.path.join(HERE, '[0-9]*.py'))):
+    migrations = []
+    for module in sorted(glob(os.path.join(here, '[0-9]*.py'))):
         module_name, _ = os.path.basename(module).rsplit('.', 1)
         mod = import_module('.' + module_name, package=package)
 
         version, label = module_name.split('_', 1)
 
-        yield int(version), label, mod.migrate
+        migrations.append((int(version), label, mod))
+    return tuple(migrations)
+
+
+def _get_migrations():
+    """
+    Return a generator with all JSON migrations sorted.
+
+    Each item is a tuple with:
+      - the version number (int)
+      - the label of the migration
+      - the reference to the migrate() function
+
+    """
+    for version, label, mod in _load_migrations(HERE, package):
+        yield version, label, mod.migrate
 
 
 def migrate(data, version_src=0):
@@ -35,9 +54,16 @@ def migrate(data, version_src=0):
     ``data``.
 
     """
-    for version, label, func in list(_get_migrations()):
+    migrations = _load_migrations(HERE, package)
+    if not migrations or version_src >= migrations[-1][0]:
+        # Already up to date
+        return data
+
+    for version, label, mod in migrations:
         if version_src < version:
-            data = func(data)
+            # The migrate() functions are looked up on each call, to allow
+            # patching them.
+            data = mod.migrate(data)
             data['version'] = version
             version_src = version
 
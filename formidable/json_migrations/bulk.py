@@ -0,0 +1,70 @@
+"""
+Migration of many Formidable JSON documents.
+
+The documents are migrated as a stream, chunk by chunk, optionally in a pool
+of worker processes: memory stays flat whatever the number of documents.
+Each document is migrated from its own ``version`` (``0`` when missing).
+
+.. code-block:: python
+
+    >>> from formidable.json_migrations.bulk import migrate_documents
+    >>> for document in migrate_documents(
+    ...         row.schema for row in Archive.objects.iterator()):
+    ...     store(document)
+
+JSON Lines files can be migrated with the ``formidable_migrate_json``
+management command:
+
+.. code-block:: sh
+
+    $ python manage.py formidable_migrate_json forms.jsonl migrated.jsonl \\
+        --processes 4
+
+.. autofunction:: migrate_documents
+
+.. autofunction:: migrate_json_lines
+
+"""
+import json
+
+from formidable.json_migrations import migrate
+from formidable.utils import map_chunks
+
+
+def migrate_document(data):
+    return migrate(data, data.get('version', 0))
+
+
+def _migrate_documents(documents):
+    return [migrate_document(data) for data in documents]
+
+
+def _migrate_lines(lines):
+    return [
+        json.dumps(migrate_document(json.loads(line)))
+        for line in lines
+    ]
+
+
+def migrate_documents(documents, processes=None, chunksize=500):
+    """
+    Migrate each dict of the iterable ``documents`` to the latest version,
+    and yield them in the same order.
+
+    When ``processes`` is set, the documents are migrated by chunks of
+    ``chunksize`` documents in a pool of ``processes`` worker processes.
+    """
+    return map_chunks(_migrate_documents, documents, chunksize, processes)
+
+
+def migrate_json_lines(lines, processes=None, chunksize=500):
+    """
+    Migrate each JSON document of the iterable of JSON Lines ``lines``, e.g.
+    a file, and yield the JSON of the migrated documents in the same order,
+    without line breaks. Blank lines are skipped.
+
+    The documents are decoded and encoded by the worker processes when
+    ``processes`` is set, see :func:`migrate_documents`.
+    """
+    lines = (line for line in lines if line.strip())
+    return map_chunks(_migrate_lines, lines, chunksize, processes)
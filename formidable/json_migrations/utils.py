@@ -14,7 +14,8 @@ def get_access_from_context_field(field):
 
 
 def uncontextualize_field(field, role):
-    new_field = deepcopy(field)
+    # The nested values aren't modified, a shallow copy is enough
+    new_field = dict(field)
     access = get_access_from_context_field(field)
     del new_field['disabled']
     del new_field['required']
@@ -23,20 +24,50 @@ def uncontextualize_field(field, role):
 
 
 def add_fields(ref_fields, new_fields):
-    current_field = 0
-
+    """
+    Merge ``new_fields`` into ``ref_fields``: the accesses of the fields
+    already in ``ref_fields`` are extended, the other fields are inserted
+    after the previous field of ``new_fields``.
+    """
+    # ``ref_fields`` is handled as a linked list of the field indexes,
+    # so that fields are inserted in constant time.
+    fields = list(ref_fields)
+    next_index = list(range(1, len(fields) + 1))
+    head = 0 if fields else None
+    if next_index:
+        next_index[-1] = None
+    indexes = {}
+    for index, field in enumerate(fields):
+        indexes.setdefault(field['slug'], index)
+
+    # Index of the field after which fields are inserted (None: at the head)
+    current = None
     for field in new_fields:
-        for index, ref_field in enumerate(ref_fields):
-            if field['slug'] == ref_field['slug']:
-                # no need to insert a new field :
-                # update accesses and move the cursor
-                ref_field['accesses'].extend(field['accesses'])
-                current_field = index + 1
-                break
+        index = indexes.get(field['slug'])
+        if index is not None:
+            # no need to insert a new field :
+            # update accesses and move the cursor
+            fields[index]['accesses'].extend(field['accesses'])
+            current = index
+            continue
+        # we need to insert field at the right position
+        index = len(fields)
+        fields.append(field)
+        indexes[field['slug']] = index
+        if current is None:
+            next_index.append(head)
+            head = index
         else:
-            # we need to insert field at the right position
-            ref_fields.insert(current_field, field)
-            current_field += 1
+            next_index.append(next_index[current])
+            next_index[current] = index
+        current = index
+
+    ordered = []
+    index = head
+    while index is not None:
+        ordered.append(fields[index])
+        index = next_index[index]
+    ref_fields[:] = ordered
 
 
 def merge_context_forms(forms):
@@ -54,7 +85,11 @@ def merge_context_forms(forms):
     # Formidable and ContextForm JSON formats only differs by the field
     # attribute (and some missing attributes in ContextForm). We can copy
     # everything and overwrite `fields`.
-    form = deepcopy(forms[roles[0]])
+    form = {
+        # `fields` is overwritten, don't copy them
+        key: deepcopy(value) if key != 'fields' else None
+        for key, value in forms[roles[0]].items()
+    }
     fields = []
     for role in roles:
         add_fields(fields,
@@ -62,9 +97,10 @@ def merge_context_forms(forms):
                     for field in forms[role]['fields']])
 
     # fix missing accesses in `fields`
-    for role in roles:
-        for field in fields:
-            if role not in [a['access_id'] for a in field['accesses']]:
+    for field in fields:
+        access_ids = {access['access_id'] for access in field['accesses']}
+        for role in roles:
+            if role not in access_ids:
                 field['accesses'].append(
                     {'access_id': role, 'level': constants.HIDDEN}
                 )
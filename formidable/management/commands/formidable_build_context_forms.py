@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from formidable.context_forms import build_context_forms, get_store
+from formidable.models import Formidable
+
+
+class Command(BaseCommand):
+    help = 'Build the ContextForm documents of every role, for each form'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'ids', nargs='*', type=int,
+            help='Primary keys of the forms to build (default: all forms)',
+        )
+
+    def handle(self, *args, **options):
+        store = get_store()
+        if store is None:
+            raise CommandError(
+                'The ContextForm store is disabled, '
+                'set FORMIDABLE_CONTEXT_FORM_CACHE to enable it.'
+            )
+        queryset = Formidable.objects.order_by('pk')
+        if options['ids']:
+            queryset = queryset.filter(pk__in=options['ids'])
+        count = 0
+        for formidable in queryset.iterator():
+            build_context_forms(formidable, store)
+            count += 1
+        self.stdout.write(
+            'Built the ContextForm documents of %d form(s)' % count
+        )
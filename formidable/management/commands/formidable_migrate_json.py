@@ -0,0 +1,75 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from formidable.json_migrations.bulk import migrate_json_lines
+
+
+class Command(BaseCommand):
+    help = (
+        'Migrate the Formidable JSON documents of a JSON Lines file to the '
+        'latest version'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', help='JSON Lines file to migrate, "-" for stdin',
+        )
+        parser.add_argument(
+            'output', help='JSON Lines file to write, "-" for stdout',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help='Number of worker processes (default: no pool)',
+        )
+        parser.add_argument(
+            '--chunksize', type=int, default=500,
+            help='Number of documents migrated at once (default: 500)',
+        )
+
+    def open(self, path, mode, default):
+        if path == '-':
+            return default
+        try:
+            return open(path, mode, encoding='utf-8')
+        except OSError as e:
+            raise CommandError(e)
+
+    def handle(self, *args, **options):
+        # Report on stderr when the documents are written on stdout
+        report = self.stderr if options['output'] == '-' else self.stdout
+        chunksize = options['chunksize']
+        source = self.open(options['input'], 'r', sys.stdin)
+        target = self.open(options['output'], 'w', self.stdout)
+        start = time.monotonic()
+        count = 0
+        try:
+            for line in migrate_json_lines(
+                    source, options['processes'], chunksize):
+                # OutputWrapper.write() adds the line break
+                target.write(line if target is self.stdout else line + '\n')
+                count += 1
+                if options['verbosity'] > 1 and not count % chunksize:
+                    report.write(self.get_report(count, start))
+        except json.JSONDecodeError as e:
+            raise CommandError(
+                'Invalid JSON document ({} document(s) written): {}'.format(
+                    count, e
+                )
+            )
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if target is not self.stdout:
+                target.close()
+        report.write(self.get_report(count, start))
+
+    def get_report(self, count, start):
+        elapsed = time.monotonic() - start
+        return (
+            'Migrated {} document(s) in {:.1f}s ({:.0f} documents/s)'.format(
+                count, elapsed, count / elapsed if elapsed else 0
+            )
+        )
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formidable', '0011_allow_empty_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formidable',
+            name='revision',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formidable', '0012_formidable_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formidable',
+            name='schema_snapshot',
+            field=jsonfield.fields.JSONField(
+                blank=True, default=None, editable=False, null=True
+            ),
+        ),
+    ]
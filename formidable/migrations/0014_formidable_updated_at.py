@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('formidable', '0013_formidable_schema_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formidable',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
@@ -1,3 +1,6 @@
+import copy
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -23,11 +26,58 @@ class Formidable(models.Model):
     label = models.CharField(max_length=256)
     description = models.TextField(blank=True)
     conditions = JSONField(null=False, blank=False, default=list)
+    revision = models.PositiveIntegerField(default=0, editable=False)
+    schema_snapshot = JSONField(null=True, blank=True, default=None,
+                                editable=False)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
 
     class Meta:
         app_label = 'formidable'
 
-    def get_django_form_class(self, role=None, field_factory=None):
+    @classmethod
+    def get_revision(cls, pk):
+        """
+        Return the current revision of the form ``pk``, reading a single
+        column of a single row.
+
+        The revision is incremented each time the form is modified through
+        the serializers or
+        :meth:`formidable.forms.FormidableForm.to_formidable` and can be used
+        to check whether a cached representation of the form is still valid.
+        """
+        return cls.objects.values_list('revision', flat=True).get(pk=pk)
+
+    def bump_revision(self, save=True):
+        """
+        Increment the revision of the form.
+
+        The increment is done by the database, so concurrent writes can't
+        end up with the same revision. If ``save`` is ``False``, the
+        increment is only set on the instance and will be applied by the
+        next call to :meth:`save`.
+        """
+        self.revision = models.F('revision') + 1
+        if save:
+            self.save(update_fields=['revision', 'updated_at'])
+            self.refresh_from_db(fields=['revision'])
+
+    def get_cache_version(self):
+        """
+        Return a string identifying the current state of the form, out of its
+        revision and its ``updated_at`` date.
+
+        Unlike the revision alone, it differs between a deleted form and a
+        new form reusing its primary key, so it can be used in the keys of
+        the representations of the form stored out of the database.
+        """
+        updated_at = self.updated_at
+        return '{}-{}'.format(
+            self.revision,
+            updated_at.isoformat() if updated_at is not None else '',
+        )
+
+    def get_django_form_class(self, role=None, field_factory=None,
+                              from_snapshot=False):
         """
         Return the django form class associated with the formidable definition.
         If no role_id is provided all the fields are fetched with an
@@ -35,9 +85,13 @@ class Formidable(models.Model):
         :params role: Fetch defined access for the specified role.
         :params field_factory: Instance of Custom field factory if needed.
         :params field_map: Custom Field Builder used by the field_factory.
+        :params from_snapshot: Build the class out of the schema snapshot
+        of the form, if available.
         """
         from formidable.forms import get_dynamic_form_class
-        return get_dynamic_form_class(self, role, field_factory)
+        return get_dynamic_form_class(
+            self, role, field_factory, from_snapshot=from_snapshot
+        )
 
     def get_next_field_order(self):
         """
@@ -66,7 +120,45 @@ class Formidable(models.Model):
 
         return serializer.save(**kwargs)
 
-    def to_json(self):
+    def get_schema_snapshot(self):
+        """
+        Return the schema snapshot of the form, or ``None`` if there is no
+        snapshot or if it has been generated for an older JSON version.
+        """
+        from formidable import json_version
+        snapshot = self.schema_snapshot
+        if not snapshot or snapshot.get('version') != json_version:
+            return None
+        return snapshot
+
+    def refresh_schema_snapshot(self):
+        """
+        Store the Formidable JSON of the form in the ``schema_snapshot``
+        column, if ``FORMIDABLE_SCHEMA_SNAPSHOT`` is enabled. Otherwise, an
+        existing snapshot is dropped since it's not maintained anymore.
+        """
+        if getattr(settings, 'FORMIDABLE_SCHEMA_SNAPSHOT', False):
+            from formidable.serializers import FormidableSerializer
+            self.schema_snapshot = FormidableSerializer(self).data
+        elif self.schema_snapshot is None:
+            return
+        else:
+            self.schema_snapshot = None
+        Formidable.objects.filter(pk=self.pk).update(
+            schema_snapshot=self.schema_snapshot
+        )
+
+    def to_json(self, from_snapshot=False):
+        """
+        Return the Formidable JSON of the form.
+
+        :params from_snapshot: Use the schema snapshot of the form, if
+          available, instead of loading all the fields from the database.
+        """
+        if from_snapshot:
+            snapshot = self.get_schema_snapshot()
+            if snapshot is not None:
+                return copy.deepcopy(snapshot)
         from formidable.serializers import FormidableSerializer
         json_data = FormidableSerializer(self).data
         return json_data
@@ -1,28 +1,56 @@
+"""
+Sanitization of the texts of the forms, using the function set by
+``DJANGO_FORMIDABLE_SANITIZE_FUNCTION``.
+
+The function is imported once, and then kept until a setting changes.
+:func:`sanitize_many` sanitizes a whole list of texts, e.g. the labels of the
+items of a field, in a single call.
+
+.. autofunction:: sanitize
+
+.. autofunction:: sanitize_many
+"""
 import logging
 
 from django.conf import settings
 from django.utils.module_loading import import_string
 
+from formidable.utils import import_cached_object
+
 logger = logging.getLogger(__name__)
 
 
-def get_clean_function(*args, **kwargs):
+def _no_clean(s):
+    return s
 
-    def _no_clean(s):
-        return s
 
-    if not hasattr(settings, 'DJANGO_FORMIDABLE_SANITIZE_FUNCTION'):
-        return _no_clean
-    if not settings.DJANGO_FORMIDABLE_SANITIZE_FUNCTION:
+def get_clean_function(*args, **kwargs):
+    path = getattr(settings, 'DJANGO_FORMIDABLE_SANITIZE_FUNCTION', None)
+    if not path:
         return _no_clean
 
     try:
-        clean_function = import_string(
-            settings.DJANGO_FORMIDABLE_SANITIZE_FUNCTION
-        )
+        clean_function = import_cached_object(path, import_string)
     except ImportError:
         logger.error("This application has no sanitization function. "
                      "There's a risk of XSS attack")
         clean_function = _no_clean
 
     return clean_function
+
+
+def sanitize(value):
+    """
+    Return the sanitized ``value``. Empty values are returned as is.
+    """
+    if not value:
+        return value
+    return get_clean_function()(value)
+
+
+def sanitize_many(values):
+    """
+    Return the list of the sanitized ``values``, as :func:`sanitize` would.
+    """
+    clean_function = get_clean_function()
+    return [clean_function(value) if value else value for value in values]
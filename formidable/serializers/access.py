@@ -1,7 +1,7 @@
 from rest_framework import serializers
 from rest_framework.serializers import ValidationError
 
-from formidable.accesses import get_accesses
+from formidable.accesses import get_accesses, get_accesses_ids
 from formidable.constants import EDITABLE
 from formidable.models import Access
 from formidable.serializers.list import NestedListSerializer
@@ -51,8 +51,8 @@ class AccessSerializer(serializers.ModelSerializer):
         list_serializer_class = AccessListSerializer
 
     def validate_access_id(self, value):
-        accesses_ids = [access.id for access in get_accesses()]
-        if value not in accesses_ids:
+        if value not in get_accesses_ids():
+            accesses_ids = [access.id for access in get_accesses()]
             raise serializers.ValidationError(
                 '{value} is unknown, valid access {accesses_ids}'.format(
                     value=value, accesses_ids=accesses_ids
@@ -1,7 +1,7 @@
 from rest_framework import serializers
 
 from formidable.models import Default
-from formidable.security import get_clean_function
+from formidable.security import sanitize_many
 from formidable.serializers.list import NestedListSerializerDummyUpdate
 
 
@@ -10,6 +10,12 @@ class DefaultListSerializer(NestedListSerializerDummyUpdate):
     field_id = 'value'
     parent_name = 'field_id'
 
+    def validate(self, data):
+        values = sanitize_many([default['value'] for default in data])
+        for default, value in zip(data, values):
+            default['value'] = value
+        return super().validate(data)
+
 
 class DefaultSerializer(serializers.ModelSerializer):
 
@@ -27,8 +33,3 @@ class DefaultSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         return instance.value
-
-    def validate_value(self, value):
-        if not value:
-            return value
-        return get_clean_function()(value)
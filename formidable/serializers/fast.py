@@ -0,0 +1,271 @@
+"""
+Read-only fast rendering of the Formidable JSON.
+
+:class:`FastFormidableSerializer` renders the same document as
+:class:`formidable.serializers.FormidableSerializer`, without building model
+instances nor going through the nested DRF serializers for each field.
+The rows of each table are loaded using ``values()``, then rendered through
+a plan compiled once per registered field serializer, out of its readable
+fields: model columns are converted by their DRF field, nested lists are
+rendered out of the related rows.
+
+Field serializers which can't be compiled (custom ``to_representation``,
+readable fields which aren't model columns, ...) are rendered by DRF, so
+any registered field type is supported.
+
+.. autoclass:: FastFormidableSerializer
+
+"""
+import threading
+from collections import OrderedDict, defaultdict
+
+from django.db.models import Prefetch
+
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+
+from formidable import json_version
+from formidable.models import Access, Default, Field, Item, Validation
+from formidable.serializers.child_proxy import LazyChildProxy
+from formidable.serializers.defaults import DefaultSerializer
+from formidable.serializers.fields import (
+    FieldListSerializer, FieldSerializer, field_register
+)
+from formidable.serializers.forms import FormidableSerializer
+from formidable.serializers.validation import validation_register
+
+# Related lists of a field, and the ordering used by FieldListSerializer
+RELATED_MODELS = {
+    'items': (Item, ('order',)),
+    'accesses': (Access, ()),
+    'validations': (Validation, ()),
+    'defaults': (Default, ()),
+}
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def get_columns(model):
+    return {
+        field.attname for field in model._meta.concrete_fields
+        if not field.is_relation
+    }
+
+
+def compile_column(field, columns):
+    """
+    Return a function rendering a model column out of a ``values()`` row,
+    the way DRF renders it.
+    """
+    if isinstance(field, (serializers.BaseSerializer, RelatedField,
+                          serializers.SerializerMethodField)):
+        raise NotCompilable(field.field_name)
+    if len(field.source_attrs) != 1 or field.source_attrs[0] not in columns:
+        raise NotCompilable(field.field_name)
+    source = field.source_attrs[0]
+    to_representation = field.to_representation
+
+    def render(row):
+        value = row[source]
+        if value is None:
+            return None
+        return to_representation(value)
+
+    return render
+
+
+def compile_row_serializer(serializer, model):
+    """
+    Return a function rendering a ``values()`` row of ``model`` the way the
+    ModelSerializer ``serializer`` renders an instance.
+    """
+    to_representation = type(serializer).to_representation
+    if to_representation is DefaultSerializer.to_representation:
+        return lambda row: row['value']
+    if to_representation is not serializers.Serializer.to_representation:
+        raise NotCompilable(type(serializer).__name__)
+    columns = get_columns(model)
+    plan = [
+        (field.field_name, compile_column(field, columns))
+        for field in serializer._readable_fields
+    ]
+
+    def render(row):
+        return OrderedDict((name, render(row)) for name, render in plan)
+
+    return render
+
+
+def compile_nested_list(field):
+    """
+    Return the name of the related list and a function rendering its rows.
+    """
+    if type(field).to_representation is not \
+            serializers.ListSerializer.to_representation:
+        raise NotCompilable(field.field_name)
+    if field.source not in RELATED_MODELS:
+        raise NotCompilable(field.field_name)
+    model, _ = RELATED_MODELS[field.source]
+    child = field.child
+    if isinstance(child, LazyChildProxy):
+        lookup = child.lookup_field
+        renderers = {
+            key: compile_row_serializer(serializer, model)
+            for key, serializer in child.register.items()
+        }
+
+        def render_row(row):
+            return renderers[row[lookup]](row)
+    else:
+        render_row = compile_row_serializer(child, model)
+
+    def render(rows):
+        return [render_row(row) for row in rows]
+
+    return field.source, render
+
+
+class FieldPlan:
+    """
+    Compiled rendering of the fields handled by a field serializer.
+    """
+
+    def __init__(self, serializer):
+        if type(serializer).to_representation is not \
+                FieldSerializer.to_representation:
+            raise NotCompilable(type(serializer).__name__)
+        columns = get_columns(Field)
+        self.columns = []
+        self.related = []
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.ListSerializer):
+                self.related.append(
+                    (field.field_name,) + compile_nested_list(field)
+                )
+            else:
+                self.columns.append(
+                    (field.field_name, compile_column(field, columns))
+                )
+        self.order = [
+            field.field_name for field in serializer._readable_fields
+        ]
+        self.config_fields = serializer.get_config_fields()
+
+    @property
+    def sources(self):
+        return {source for _, source, _ in self.related}
+
+    def render(self, row, related):
+        data = {name: render(row) for name, render in self.columns}
+        for name, source, render in self.related:
+            data[name] = render(related[source].get(row['id'], ()))
+        field = OrderedDict((name, data[name]) for name in self.order)
+        parameters = row['parameters']
+        if parameters is not None:
+            for config_field in self.config_fields:
+                field[config_field] = parameters.get(config_field)
+        return field
+
+
+class FastFormidableSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer rendering the Formidable JSON of a form.
+
+    The output is identical to the one of
+    :class:`formidable.serializers.FormidableSerializer`. Use it in place of
+    the latter for read operations only, e.g. by setting the
+    ``use_fast_serializer`` attribute of
+    :class:`formidable.views.FormidableDetail`.
+    """
+
+    _plans = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_plan(cls, serializer_class):
+        """
+        Return the compiled plan of ``serializer_class``, or ``None`` if the
+        fields it handles have to be rendered by DRF.
+        """
+        key = (serializer_class, tuple(validation_register.items()))
+        try:
+            return cls._plans[key]
+        except KeyError:
+            pass
+        try:
+            plan = FieldPlan(serializer_class())
+        except NotCompilable:
+            plan = None
+        with cls._lock:
+            cls._plans[key] = plan
+        return plan
+
+    def to_representation(self, instance):
+        serializer = FormidableSerializer(context=self.context)
+        data = OrderedDict()
+        for field in serializer._readable_fields:
+            if isinstance(field, FieldListSerializer):
+                data[field.field_name] = self.render_fields(instance, field)
+                continue
+            attribute = field.get_attribute(instance)
+            if attribute is None:
+                data[field.field_name] = None
+            else:
+                data[field.field_name] = field.to_representation(attribute)
+        data['version'] = json_version
+        return data
+
+    def render_fields(self, instance, list_serializer):
+        rows = list(
+            Field.objects.filter(form_id=instance.pk)
+            .order_by('order').values()
+        )
+        plans = {}
+        sources = set()
+        for row in rows:
+            type_id = row['type_id']
+            if type_id not in plans:
+                plans[type_id] = self.get_plan(field_register[type_id])
+                if plans[type_id] is not None:
+                    sources |= plans[type_id].sources
+
+        related = self.load_related(
+            [row['id'] for row in rows if plans[row['type_id']]], sources
+        )
+        fallback = self.load_fallback(
+            [row['id'] for row in rows if not plans[row['type_id']]]
+        )
+        child = list_serializer.child
+        result = []
+        for row in rows:
+            plan = plans[row['type_id']]
+            if plan is None:
+                result.append(child.to_representation(fallback[row['id']]))
+            else:
+                result.append(plan.render(row, related))
+        return result
+
+    def load_related(self, field_ids, sources):
+        related = {}
+        for source in sources:
+            model, ordering = RELATED_MODELS[source]
+            related[source] = rows_by_field = defaultdict(list)
+            if not field_ids:
+                continue
+            qs = model.objects.filter(field_id__in=field_ids)
+            if ordering:
+                qs = qs.order_by(*ordering)
+            for row in qs.values():
+                rows_by_field[row['field_id']].append(row)
+        return related
+
+    def load_fallback(self, field_ids):
+        if not field_ids:
+            return {}
+        qs = Field.objects.filter(pk__in=field_ids).prefetch_related(
+            Prefetch('items', queryset=Item.objects.order_by('order')),
+            'defaults', 'validations', 'accesses'
+        )
+        return {field.pk: field for field in qs}
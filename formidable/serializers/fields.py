@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.db.models import Prefetch
 from django.utils.functional import cached_property
 
@@ -8,9 +10,9 @@ from rest_framework.settings import api_settings
 from rest_framework.utils import html
 
 from formidable import constants
-from formidable.models import Access, Field, Item
+from formidable.models import Access, Default, Field, Item, Validation
 from formidable.register import FieldSerializerRegister, load_serializer
-from formidable.security import get_clean_function
+from formidable.security import sanitize
 from formidable.serializers.access import AccessSerializer
 from formidable.serializers.child_proxy import LazyChildProxy
 from formidable.serializers.common import WithNestedSerializer
@@ -30,6 +32,14 @@ field_register = FieldSerializerRegister.get_instance()
 class FieldListSerializer(NestedListSerializer):
     field_id = 'slug'
     parent_name = 'form_id'
+    # Nested lists of a field written in bulk: model and column identifying
+    # the rows to update (``None`` when rows are matched by position)
+    bulk_nested_objects = {
+        'accesses': (Access, 'access_id'),
+        'items': (Item, 'value'),
+        'validations': (Validation, None),
+        'defaults': (Default, None),
+    }
 
     def __init__(self, *args, **kwargs):
         kwargs['child'] = LazyChildProxy(field_register)
@@ -102,6 +112,194 @@ class FieldListSerializer(NestedListSerializer):
 
         return ret
 
+    def supports_bulk(self, validated_data):
+        """
+        Return whether the fields can be written in bulk, i.e. none of their
+        serializers customizes the way the objects are saved.
+        """
+        type_ids = {data['type_id'] for data in validated_data}
+        return all(
+            is_bulk_compatible(self.child.get_right_serializer(type_id))
+            for type_id in type_ids
+        )
+
+    def create(self, parent, validated_data):
+        if not self.supports_bulk(validated_data):
+            return super().create(parent, validated_data)
+        self.bulk_create(parent, validated_data)
+
+    def update(self, qs, parent, validated_data):
+        """
+        Write the fields and their nested objects with a fixed number of
+        queries, whatever the number of fields.
+
+        The submitted objects are compared to the current rows, and only the
+        changes are written: unchanged rows are not touched, and changed rows
+        are updated on their modified columns only.
+        """
+        if not self.supports_bulk(validated_data):
+            return super().update(qs, parent, validated_data)
+
+        existing = {field.slug: field for field in qs.all()}
+        slugs = {data['slug'] for data in validated_data}
+        deleted = [
+            field.pk for slug, field in existing.items() if slug not in slugs
+        ]
+
+        created = []
+        updated = []
+        columns = set()
+        nested = {}
+        for data in validated_data:
+            field = existing.get(data['slug'])
+            if field is None:
+                created.append(data)
+                continue
+            nested[field.pk] = self.extract_bulk_nested_data(data)
+            changed = apply_changes(field, data)
+            if changed:
+                columns |= changed
+                updated.append(field)
+
+        if deleted:
+            qs.filter(pk__in=deleted).delete()
+        if updated:
+            Field.objects.bulk_update(updated, sorted(columns))
+        self.bulk_update_nested(nested)
+        if created:
+            self.bulk_create(parent, created)
+
+    def extract_bulk_nested_data(self, data):
+        return {
+            name: data.pop(name) for name in self.bulk_nested_objects
+            if name in data
+        }
+
+    def bulk_create(self, parent, validated_data):
+        fields = []
+        nested = []
+        for data in validated_data:
+            nested.append(self.extract_bulk_nested_data(data))
+            data[self.parent_name] = parent.id
+            fields.append(Field(**data))
+        Field.objects.bulk_create(fields)
+        if fields and fields[0].pk is None:
+            # The database backend doesn't return the primary keys of the
+            # inserted rows
+            ids = dict(
+                Field.objects.filter(form_id=parent.id)
+                .values_list('slug', 'id')
+            )
+            for field in fields:
+                field.pk = ids[field.slug]
+
+        objects = defaultdict(list)
+        for field, nested_data in zip(fields, nested):
+            for name, rows in nested_data.items():
+                model, _ = self.bulk_nested_objects[name]
+                objects[model].extend(
+                    model(field_id=field.pk, **row) for row in rows
+                )
+        for model, objs in objects.items():
+            if objs:
+                model.objects.bulk_create(objs)
+
+    def bulk_update_nested(self, nested):
+        for name, (model, key) in self.bulk_nested_objects.items():
+            rows_by_field = {
+                field_id: nested_data[name]
+                for field_id, nested_data in nested.items()
+                if name in nested_data
+            }
+            if not rows_by_field:
+                continue
+            if key is None:
+                self.bulk_update_sequences(model, rows_by_field)
+            else:
+                self.bulk_update_rows(model, key, rows_by_field)
+
+    def bulk_update_rows(self, model, key, rows_by_field):
+        """
+        Synchronize the rows of ``model`` identified by their ``key`` column.
+        """
+        existing = defaultdict(dict)
+        qs = model.objects.filter(field_id__in=list(rows_by_field))
+        for obj in qs:
+            existing[obj.field_id][getattr(obj, key)] = obj
+
+        deleted, updated, created = [], [], []
+        columns = set()
+        for field_id, rows in rows_by_field.items():
+            current = existing[field_id]
+            keys = set()
+            for row in rows:
+                keys.add(row[key])
+                obj = current.get(row[key])
+                if obj is None:
+                    created.append(model(field_id=field_id, **row))
+                    continue
+                changed = apply_changes(obj, row)
+                if changed:
+                    columns |= changed
+                    updated.append(obj)
+            deleted.extend(
+                obj.pk for value, obj in current.items() if value not in keys
+            )
+        self.bulk_write(model, deleted, updated, columns, created)
+
+    def bulk_update_sequences(self, model, rows_by_field):
+        """
+        Synchronize the rows of ``model`` which have no identifying column,
+        by position: the n-th submitted row is compared to the n-th current
+        row, extra rows are created or deleted.
+        """
+        existing = defaultdict(list)
+        qs = model.objects.filter(field_id__in=list(rows_by_field))
+        for obj in qs.order_by('pk'):
+            existing[obj.field_id].append(obj)
+        # Rows are replaced, omitted columns are reset to their default
+        defaults = {
+            field.attname: field.get_default()
+            for field in model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation
+        }
+
+        deleted, updated, created = [], [], []
+        columns = set()
+        for field_id, rows in rows_by_field.items():
+            current = existing[field_id]
+            for obj, row in zip(current, rows):
+                changed = apply_changes(obj, dict(defaults, **row))
+                if changed:
+                    columns |= changed
+                    updated.append(obj)
+            created.extend(
+                model(field_id=field_id, **row) for row in rows[len(current):]
+            )
+            deleted.extend(obj.pk for obj in current[len(rows):])
+        self.bulk_write(model, deleted, updated, columns, created)
+
+    def bulk_write(self, model, deleted, updated, columns, created):
+        if deleted:
+            model.objects.filter(pk__in=deleted).delete()
+        if updated:
+            model.objects.bulk_update(updated, sorted(columns))
+        if created:
+            model.objects.bulk_create(created)
+
+
+def apply_changes(obj, data):
+    """
+    Set the values of ``data`` on ``obj``, and return the names of the
+    attributes whose value has changed.
+    """
+    changed = set()
+    for attr, value in data.items():
+        if getattr(obj, attr) != value:
+            setattr(obj, attr, value)
+            changed.add(attr)
+    return changed
+
 
 class FieldSerializer(WithNestedSerializer):
     type_id = None
@@ -145,24 +343,14 @@ class FieldSerializer(WithNestedSerializer):
         list_serializer_class = FieldListSerializer
         fields = '__all__'
 
-    @cached_property
-    def _clean_function(self):
-        return get_clean_function()
-
     def validate_label(self, label):
-        if not label:
-            return label
-        return self._clean_function(label)
+        return sanitize(label)
 
     def validate_description(self, description):
-        if not description:
-            return description
-        return self._clean_function(description)
+        return sanitize(description)
 
     def validate_placeholder(self, placeholder):
-        if not placeholder:
-            return placeholder
-        return self._clean_function(placeholder)
+        return sanitize(placeholder)
 
     @cached_property
     def access_serializer(self):
@@ -177,6 +365,40 @@ class FieldSerializer(WithNestedSerializer):
         return self.fields['defaults']
 
 
+def is_bulk_compatible(serializer):
+    """
+    Return whether the objects handled by the field serializer ``serializer``
+    can be written in bulk by the :class:`FieldListSerializer`: neither the
+    serializer nor its nested serializers override the way objects are
+    created or updated.
+    """
+    if type(serializer).create not in (
+            FieldSerializer.create, FieldItemMixin.create):
+        return False
+    if type(serializer).update not in (
+            FieldSerializer.update, FieldItemMixin.update):
+        return False
+    for name, field in serializer.fields.items():
+        if not isinstance(field, serializers.ListSerializer):
+            continue
+        if field.read_only:
+            continue
+        declared = FieldSerializer._declared_fields.get(name)
+        if type(field) is not type(declared):
+            return False
+        child = field.child
+        if isinstance(child, LazyChildProxy):
+            children = child.get_all_serializer()
+        else:
+            children = [child]
+        for child in children:
+            if type(child).create is not serializers.ModelSerializer.create:
+                return False
+            if type(child).update is not serializers.ModelSerializer.update:
+                return False
+    return True
+
+
 class ListContextFieldSerializer(serializers.ListSerializer):
 
     def set_context(self, key, value):
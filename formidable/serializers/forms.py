@@ -1,17 +1,17 @@
-import copy
 from collections import defaultdict
 
 from django.conf import settings
 from django.db import transaction
-from django.utils.functional import cached_property
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from formidable import constants, json_version
+from formidable.accesses import accesses_loaded_once, get_accesses
 from formidable.forms import conditions
+from formidable.forms.cache import form_class_cache, validation_plan_cache
 from formidable.models import Formidable
-from formidable.security import get_clean_function
+from formidable.security import sanitize
 from formidable.serializers import fields
 from formidable.serializers.common import WithNestedSerializer
 
@@ -58,15 +58,16 @@ class FormidableSerializer(WithNestedSerializer):
         depth = 2
         extra_kwargs = {'id': {'read_only': True}}
 
-    @cached_property
-    def _clean_function(self):
-        return get_clean_function()
+    def run_validation(self, data=serializers.empty):
+        # Load the accesses once for all the fields
+        with accesses_loaded_once():
+            return super().run_validation(data)
 
     def validate_label(self, label):
-        return self._clean_function(label)
+        return sanitize(label)
 
     def validate_description(self, description):
-        return self._clean_function(description)
+        return sanitize(description)
 
     def validate(self, data):
         """
@@ -88,13 +89,23 @@ class FormidableSerializer(WithNestedSerializer):
         if conditions:
             instance.conditions = conditions
             instance.save()
+        instance.refresh_schema_snapshot()
+        form_class_cache.invalidate(instance.pk)
+        validation_plan_cache.invalidate(instance.pk)
         return instance
 
     def update(self, instance, validated_data):
         instance.conditions = validated_data.pop('conditions', None)
+        instance.bump_revision(save=False)
+        # The snapshot is out of date, drop it in the same query
+        instance.schema_snapshot = None
         instance = super().update(
             instance, validated_data
         )
+        instance.refresh_from_db(fields=['revision'])
+        instance.refresh_schema_snapshot()
+        form_class_cache.invalidate(instance.pk)
+        validation_plan_cache.invalidate(instance.pk)
         return instance
 
     def _get_fields_slugs(self, data):
@@ -150,15 +161,39 @@ class FormidableSerializer(WithNestedSerializer):
                                 type=field_type
                             )
                         )
+
+        # 2/ Check cascading conditions don't depend on each other
+        if conditions.cascade_conditions():
+            conditions_data = data['conditions']
+            try:
+                conditions.get_evaluation_order(
+                    [condition['fields_ids'] for condition in conditions_data],
+                    [
+                        [test['field_id'] for test in condition['tests']]
+                        for condition in conditions_data
+                    ],
+                )
+            except conditions.ConditionsCycleError as e:
+                names = [
+                    conditions_data[position].get('name')
+                    or '#{}'.format(position + 1)
+                    for position in e.positions
+                ]
+                raise ValidationError(
+                    'Conditions ({names}) depend on each other'.format(
+                        names=', '.join(names)
+                    )
+                )
         return data
 
     def save(self, *args, **kwargs):
         # Wrap around a transaction only if we're not already in a transaction.
         connection = transaction.get_connection()
-        if not connection.in_atomic_block:
-            with transaction.atomic():
-                return super().save(*args, **kwargs)
-        return super().save(*args, **kwargs)
+        with accesses_loaded_once():
+            if not connection.in_atomic_block:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            return super().save(*args, **kwargs)
 
     def to_representation(self, obj):
         data = super().to_representation(obj)
@@ -197,6 +232,31 @@ def get_access(accesses, role):
     return constants.EDITABLE  # default
 
 
+def get_levels(accesses):
+    """
+    Return the dict of the access' levels, indexed by role.
+
+    """
+    levels = {}
+    for access in accesses:
+        levels.setdefault(access['access_id'], access['level'])
+    return levels
+
+
+def contextualize_field(field, access):
+    """
+    Return a copy of ``field`` with its disabled/required attributes set
+    regarding the ``access`` level. Its nested values aren't copied.
+
+    """
+    new_field = {
+        key: value for key, value in field.items() if key != 'accesses'
+    }
+    new_field['disabled'] = access == constants.READONLY
+    new_field['required'] = access == constants.REQUIRED
+    return new_field
+
+
 def contextualize_fields(fields, role):
     """
     This method sets disabled/required attributes regarding the access
@@ -204,45 +264,81 @@ def contextualize_fields(fields, role):
 
     """
     for field in fields:
-        accesses = field.pop('accesses')
-        access = get_access(accesses, role)
+        access = get_access(field['accesses'], role)
         if access == constants.HIDDEN:
             continue
-        field['disabled'] = access == constants.READONLY
-        field['required'] = access == constants.REQUIRED
-        yield field
+        yield contextualize_field(field, access)
 
 
-def contextualize_conditions(form):
-    """
-    Extract conditions and filter them using the fields that exist in the form.
-    """
-    # filter conditions by fields ids for current role
-    field_ids = {field['slug'] for field in form['fields']}
-    conditions = form.get('conditions', [])
-
+def filter_conditions(conditions, field_ids):
     for condition in conditions:
         # Build the tests based on the existing fields in the form
-        condition['tests'] = [
-            t for t in condition['tests']
-            if t['field_id'] in field_ids
-        ]
+        tests = [t for t in condition['tests'] if t['field_id'] in field_ids]
         # Build the fields_ids based on the existing fields in the form.
-        condition['fields_ids'] = list(
-            set(condition.get('fields_ids', [])) & field_ids
-        )
+        fields_ids = list(set(condition.get('fields_ids', [])) & field_ids)
         # 1. If the condition "tests" is empty, remove it
         # 2. if the condition "fields_ids" is empty, remove it
-        if condition['tests'] and condition['fields_ids']:
+        if tests and fields_ids:
+            condition = dict(condition)
+            condition['tests'] = tests
+            condition['fields_ids'] = fields_ids
             yield condition
 
 
+def contextualize_conditions(form):
+    """
+    Extract conditions and filter them using the fields that exist in the form.
+    """
+    # filter conditions by fields ids for current role
+    field_ids = {field['slug'] for field in form['fields']}
+    return filter_conditions(form.get('conditions', []), field_ids)
+
+
 def contextualize(form, role):
     """
     Transform a FormidableJSON into a ContextFormJSON for a given role.
 
+    The ContextFormJSON shares the nested values of the fields and conditions
+    of ``form`` (items, validations, parameters...), which must not be
+    modified.
+
+    """
+    fields = list(contextualize_fields(form['fields'], role))
+    return build_context_form(form, fields)
+
+
+def contextualize_all(form, roles=None):
+    """
+    Transform a FormidableJSON into the ContextFormJSON of each role of
+    ``roles`` (by default, the roles returned by the
+    ``FORMIDABLE_ACCESS_RIGHTS_LOADER``), in a single pass over the fields.
+
+    Return a dict of the ContextFormJSON, indexed by role.
+
     """
-    form = copy.deepcopy(form)
-    form['fields'] = list(contextualize_fields(form['fields'], role))
-    form['conditions'] = list(contextualize_conditions(form))
-    return form
+    if roles is None:
+        roles = [access.id for access in get_accesses()]
+    fields = {role: [] for role in roles}
+    for field in form['fields']:
+        levels = get_levels(field['accesses'])
+        for role in roles:
+            access = levels.get(role, constants.EDITABLE)
+            if access != constants.HIDDEN:
+                fields[role].append(contextualize_field(field, access))
+    return {
+        role: build_context_form(form, fields[role]) for role in roles
+    }
+
+
+def build_context_form(form, fields):
+    field_ids = {field['slug'] for field in fields}
+    conditions = list(filter_conditions(form.get('conditions', []), field_ids))
+    context_form = {}
+    for key, value in form.items():
+        if key == 'fields':
+            value = fields
+        elif key == 'conditions':
+            value = conditions
+        context_form[key] = value
+    context_form.setdefault('conditions', conditions)
+    return context_form
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from formidable.models import Item
+from formidable.security import sanitize_many
 from formidable.serializers.list import NestedListSerializer
 
 
@@ -11,8 +12,10 @@ class ItemListSerializer(NestedListSerializer):
 
     def validate(self, data):
         data = super().validate(data)
-        for index, item in enumerate(data):
+        labels = sanitize_many([item['label'] for item in data])
+        for index, (item, label) in enumerate(zip(data, labels)):
             item['order'] = index
+            item['label'] = label
 
         return data
 
@@ -1,4 +1,4 @@
-import re
+from django.conf import settings
 
 from rest_framework import serializers
 from rest_framework.serializers import ValidationError
@@ -6,6 +6,7 @@ from rest_framework.serializers import ValidationError
 from formidable.models import Validation
 from formidable.register import ValidationSerializerRegister, load_serializer
 from formidable.serializers.child_proxy import LazyChildProxy
+from formidable.validators import compile_regex, has_nested_quantifiers
 
 validation_register = ValidationSerializerRegister.get_instance()
 
@@ -68,10 +69,19 @@ class RegexpSerializer(ValidationSerializer):
     def validate_value(self, value):
 
         try:
-            re.compile(value)
+            compile_regex(value)
         except Exception as e:
             raise ValidationError('Invalid regexp: {}'.format(e))
 
+        check_complexity = getattr(
+            settings, 'FORMIDABLE_CHECK_REGEXP_COMPLEXITY', False
+        )
+        if check_complexity and has_nested_quantifiers(value):
+            raise ValidationError(
+                'Invalid regexp: nested quantifiers may cause catastrophic '
+                'backtracking'
+            )
+
         return value
 
 
@@ -7,6 +7,8 @@ urlpatterns = [
             name='context_form_detail'),
     re_path(r'^forms/(?P<pk>\d+)/validate/?$', views.ValidateView.as_view(),
             name='form_validation'),
+    re_path(r'^forms/(?P<pk>\d+)/validate/batch/?$',
+            views.BatchValidateView.as_view(), name='form_batch_validation'),
     re_path(r'^builder/forms/(?P<pk>\d+)/?$', views.FormidableDetail.as_view(),
             name='form_detail'),
     re_path(r'^builder/forms/?$', views.FormidableCreate.as_view(),
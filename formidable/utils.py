@@ -1,5 +1,46 @@
+import itertools
+import logging
+import multiprocessing
+import pickle
+import threading
+from collections import deque
 from importlib import import_module
 
+import django
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
+    class ContextVar(threading.local):
+        """
+        Thread-local stand-in of :class:`contextvars.ContextVar`.
+        """
+
+        def __init__(self, name, default=None):
+            self.name = name
+            self.default = default
+
+        def get(self):
+            return getattr(self, 'value', self.default)
+
+        def set(self, value):
+            token = self.get()
+            self.value = value
+            return token
+
+        def reset(self, token):
+            self.value = token
+
+
+logger = logging.getLogger(__name__)
+
+# Objects imported by import_cached_object, indexed by path
+_imported_objects = {}
+
 
 def import_object(object_path):
     """
@@ -10,3 +51,121 @@ def import_object(object_path):
     module_path, class_name = object_path.rsplit('.', 1)
     module = import_module(module_path)
     return getattr(module, class_name)
+
+
+def import_cached_object(object_path, importer=import_object):
+    """
+    Import class or function by path with ``importer``, once: the imported
+    object is kept until a setting changes.
+    :param object_path: path to the object for import
+    :return: imported object
+    """
+    try:
+        return _imported_objects[object_path]
+    except KeyError:
+        obj = importer(object_path)
+        _imported_objects[object_path] = obj
+        return obj
+
+
+@receiver(setting_changed)
+def clear_imported_objects(**kwargs):
+    _imported_objects.clear()
+
+
+def iter_chunks(rows, size):
+    """
+    Yield the lists of ``size`` consecutive items of the iterable ``rows``
+    (the last one may be shorter).
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_process_context():
+    """
+    Return the :mod:`multiprocessing` context of the start method set by
+    ``FORMIDABLE_PROCESS_START_METHOD``, or the default context of the
+    platform when the setting is unset or names a start method the platform
+    doesn't support.
+    """
+    method = getattr(settings, 'FORMIDABLE_PROCESS_START_METHOD', None)
+    if method is not None:
+        try:
+            return multiprocessing.get_context(method)
+        except ValueError:
+            logger.warning(
+                'The %r start method is not available, using the default '
+                'start method of the platform', method
+            )
+    return multiprocessing.get_context()
+
+
+def close_connections():
+    """
+    Close the database connections of the current thread, so that forked
+    processes don't share them. The connections in a transaction are kept,
+    closing them would abort the transaction.
+    """
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def _init_process(payload):
+    """
+    Set django up in a worker process which wasn't forked, then run the
+    initializer of :func:`map_chunks`, pickled with its arguments in
+    ``payload`` so that it is only imported once django is set up.
+    """
+    django.setup()
+    initializer, initargs = pickle.loads(payload)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def map_chunks(func, rows, chunksize, processes=None, initializer=None,
+               initargs=()):
+    """
+    Yield the items of the lists returned by ``func`` for each chunk of
+    ``chunksize`` items of the iterable ``rows``, in order.
+
+    When ``processes`` is set, the chunks are processed in a pool of
+    ``processes`` worker processes, initialized by ``initializer``. At most
+    twice as many chunks as processes wait in memory, whatever the number of
+    rows.
+
+    The workers are started with the start method of
+    :func:`get_process_context`, after the idle database connections are
+    closed. Workers which aren't forked set django up again, out of the
+    ``DJANGO_SETTINGS_MODULE`` environment variable, before
+    ``initializer`` runs.
+    """
+    if not processes:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in iter_chunks(rows, chunksize):
+            yield from func(chunk)
+        return
+
+    context = get_process_context()
+    if context.get_start_method() != 'fork':
+        initargs = (pickle.dumps((initializer, initargs)),)
+        initializer = _init_process
+    close_connections()
+    pool = context.Pool(processes, initializer, initargs)
+    try:
+        pending = deque()
+        for chunk in iter_chunks(rows, chunksize):
+            pending.append(pool.apply_async(func, (chunk,)))
+            if len(pending) > 2 * processes:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
@@ -5,16 +5,202 @@ Validators
 .. autoclass: GTEValidator
     :members:
 
+Regular expressions are compiled once and shared by every form class (see
+:func:`compile_regex`). When the ``FORMIDABLE_CHECK_REGEXP_COMPLEXITY``
+setting is set, the serializers reject the patterns nesting unbounded
+quantifiers (e.g. ``(a+)+``), prone to catastrophic backtracking (see
+:func:`has_nested_quantifiers`).
+
+.. autofunction:: compile_regex
+
+.. autofunction:: has_nested_quantifiers
+
+The limit values of the validations are parsed once as well, and the
+validators produced by the built-in factories are shared by every form
+class, since they don't hold any state of their own (see
+:func:`produce_validator`).
+
+.. autofunction:: produce_validator
+
+The date validators compare the values with the current date, which can be
+fixed for a whole block of code, e.g. a batch validation, with
+:func:`reference_date`:
+
+.. code-block:: python
+
+    >>> with reference_date(date(2021, 1, 1)):
+    ...     form.is_valid()
+
+.. autofunction:: reference_date
+
+.. autofunction:: get_today
+
 """
 
+import re
+from calendar import monthrange
+from contextlib import contextmanager
 from datetime import date
 from decimal import Decimal
+from functools import lru_cache
 
 from django.core import validators
 from django.utils.functional import cached_property
 
 from dateutil.parser import parse
-from dateutil.relativedelta import relativedelta
+
+from formidable.utils import ContextVar
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Maximum number of compiled regular expressions shared by the validators
+REGEX_CACHE_SIZE = 512
+
+# Maximum number of parsed limit values and of shared validators
+VALUE_CACHE_SIZE = 1024
+VALIDATOR_CACHE_SIZE = 1024
+
+REPEAT_OPCODES = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+
+# Fully specified dates, parsed the same way whatever the current date
+ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+
+# Date the date validators compare the values with, if set
+_reference_date = ContextVar('formidable_reference_date', default=None)
+
+
+def get_today():
+    """
+    Return the date set by the enclosing :func:`reference_date` block, or
+    the current date.
+    """
+    today = _reference_date.get()
+    if today is None:
+        return date.today()
+    return today
+
+
+@contextmanager
+def reference_date(today=None):
+    """
+    Make the date validators compare the values with ``today`` (by default,
+    the current date) in the ``with`` block.
+    """
+    token = _reference_date.set(today or date.today())
+    try:
+        yield
+    finally:
+        _reference_date.reset(token)
+
+
+def add_months(day, months):
+    """
+    Return ``day`` shifted by ``months`` months, the last day of the month
+    when it doesn't have this day (e.g. Feb 29 in a non-leap year).
+    """
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    return date(
+        year, month + 1, min(day.day, monthrange(year, month + 1)[1])
+    )
+
+
+def get_age(birth_date, today):
+    """
+    Return the age in full years, on ``today``, of someone born on
+    ``birth_date``, negative for birth dates in the future, as the years of
+    a :class:`dateutil.relativedelta.relativedelta`: people born on Feb 29
+    have their birthday on Feb 28 in non-leap years.
+    """
+    months = (
+        (today.year - birth_date.year) * 12 + today.month - birth_date.month
+    )
+    if months > 0 and today < add_months(birth_date, months):
+        months -= 1
+    elif months < 0 and today > add_months(birth_date, months):
+        months += 1
+    # Full years, rounded towards zero
+    return int(months / 12)
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def compile_regex(pattern):
+    """
+    Return the compiled regular expression of ``pattern``, out of a bounded
+    cache shared by the validators and the serializers.
+    """
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE, typed=True)
+def parse_decimal(value):
+    return Decimal(value)
+
+
+def is_iso_date(value):
+    return isinstance(value, str) and ISO_DATE_RE.match(value) is not None
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def _parse_iso_date(value):
+    return parse(value).date()
+
+
+def parse_date(value):
+    """
+    Return the date of the string ``value``. The components missing from
+    the string are the ones of the current date, so only the fully
+    specified ISO dates (``YYYY-MM-DD``) are cached.
+    """
+    if is_iso_date(value):
+        return _parse_iso_date(value)
+    return parse(value).date()
+
+
+def is_hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _has_nested_quantifiers(subpattern, repeated):
+    for opcode, value in subpattern:
+        if opcode in REPEAT_OPCODES:
+            _, max_repeat, item = value
+            unbounded = max_repeat == sre_parse.MAXREPEAT
+            if unbounded and repeated:
+                return True
+            if _has_nested_quantifiers(item, repeated or unbounded):
+                return True
+        elif opcode == sre_parse.SUBPATTERN:
+            if _has_nested_quantifiers(value[-1], repeated):
+                return True
+        elif opcode == sre_parse.BRANCH:
+            if any(_has_nested_quantifiers(item, repeated)
+                   for item in value[1]):
+                return True
+        elif opcode in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if _has_nested_quantifiers(value[1], repeated):
+                return True
+        elif opcode == sre_parse.GROUPREF_EXISTS:
+            if any(_has_nested_quantifiers(item, repeated)
+                   for item in value[1:] if item is not None):
+                return True
+    return False
+
+
+def has_nested_quantifiers(pattern):
+    """
+    Return ``True`` if the regular expression ``pattern`` repeats a
+    subpattern which is itself repeated without bound, e.g. ``(a+)+`` or
+    ``(\\w*\\s?)*``. Matching such patterns may take an exponential time.
+    """
+    return _has_nested_quantifiers(sre_parse.parse(pattern), False)
 
 
 class FormidableValidator:
@@ -115,7 +301,7 @@ class DateValidator(FormidableValidator):
 
     def __init__(self, limit_value, message=None):
         super().__init__(
-            parse(limit_value).date(), message
+            parse_date(limit_value), message
         )
 
 
@@ -163,7 +349,7 @@ class DateIsInFuture(FormidableValidator, validators.BaseValidator):
         return x
 
     def compare(self, x, has_to_be_in_future):
-        today = date.today()
+        today = get_today()
         if has_to_be_in_future:
             return x <= today
         else:
@@ -175,7 +361,7 @@ class AgeAboveValidator(FormidableValidator, validators.BaseValidator):
     type = 'IS_AGE_ABOVE'
 
     def clean(self, birth_date):
-        return relativedelta(date.today(), birth_date).years
+        return get_age(birth_date, get_today())
 
     def compare(self, value, age):
         return value < age
@@ -189,7 +375,20 @@ class AgeUnderValidator(AgeAboveValidator):
         return value >= age
 
 
+@lru_cache(maxsize=VALIDATOR_CACHE_SIZE)
+def produce_validator(factory_class, type_, message, value):
+    """
+    Return the validator built by ``factory_class`` for a validation, out
+    of a bounded cache shared by every form class.
+    """
+    return factory_class().build(type_, message, value)
+
+
 class ValidatorFactory:
+    # Share the validators built by the factory across form classes. This
+    # attribute isn't inherited: subclasses, which may hold some state, only
+    # share their validators if they set it themselves.
+    share_validators = True
 
     @cached_property
     def maps(self):
@@ -206,27 +405,29 @@ class ValidatorFactory:
         }
 
     def min_length(self, limit_value, message):
-        limit_value = Decimal(limit_value)
+        limit_value = parse_decimal(limit_value)
         return validators.MinLengthValidator(limit_value, message)
 
     def max_length(self, limit_value, message):
-        limit_value = Decimal(limit_value)
+        limit_value = parse_decimal(limit_value)
         return validators.MaxLengthValidator(limit_value, message)
 
     def regexp(self, value, message):
-        return validators.RegexValidator(regex=value, message=message)
+        return validators.RegexValidator(
+            regex=compile_regex(value), message=message
+        )
 
     def gt(self, value, message):
-        return GTValidator(Decimal(value), message)
+        return GTValidator(parse_decimal(value), message)
 
     def gte(self, value, message):
-        return validators.MinValueValidator(Decimal(value), message)
+        return validators.MinValueValidator(parse_decimal(value), message)
 
     def lt(self, value, message):
-        return LTValidator(Decimal(value), message)
+        return LTValidator(parse_decimal(value), message)
 
     def lte(self, value, message):
-        return validators.MaxValueValidator(Decimal(value), message)
+        return validators.MaxValueValidator(parse_decimal(value), message)
 
     def eq(self, value, message):
         return EQValidator(value, message)
@@ -234,8 +435,23 @@ class ValidatorFactory:
     def neq(self, value, message):
         return NEQValidator(value, message)
 
+    def can_share(self, type_, msg, value):
+        """
+        Return ``True`` if the validator of the validation can be taken out
+        of the cache shared by every form class.
+        """
+        return (
+            vars(type(self)).get('share_validators', False) and
+            is_hashable(msg) and is_hashable(value)
+        )
+
     def produce(self, validation):
         type_, msg, value = self.extract_validation_attribute(validation)
+        if self.can_share(type_, msg, value):
+            return produce_validator(type(self), type_, msg, value)
+        return self.build(type_, msg, value)
+
+    def build(self, type_, msg, value):
         meth = self.maps[type_]
         return meth(value, msg)
 
@@ -250,6 +466,10 @@ class ValidatorFactory:
 
 
 class DateValidatorFactory(ValidatorFactory):
+    share_validators = True
+
+    # Validations whose limit value is a date
+    date_types = {'GT', 'GTE', 'LT', 'LTE', 'EQ', 'NEQ'}
 
     @cached_property
     def maps(self):
@@ -262,6 +482,12 @@ class DateValidatorFactory(ValidatorFactory):
 
         return _maps
 
+    def can_share(self, type_, msg, value):
+        # Partial dates depend on the current date
+        if type_ in self.date_types and not is_iso_date(value):
+            return False
+        return super().can_share(type_, msg, value)
+
     def lt(self, value, message):
         return DateLTValidator(value, message)
 
@@ -1,9 +1,13 @@
+import hashlib
 import logging
 from contextlib import contextmanager
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 
 from rest_framework import exceptions, status
 from rest_framework.generics import (
@@ -13,28 +17,39 @@ from rest_framework.response import Response
 from rest_framework.settings import import_from_string, perform_import
 from rest_framework.views import APIView
 
+from formidable import json_version
 from formidable.accesses import get_accesses, get_context
+from formidable.callbacks import get_callback_executor
+from formidable.context_forms import get_context_form, get_store
 from formidable.exception_handler import ExceptionHandlerMixin
 from formidable.forms import field_builder, get_dynamic_form_class_from_schema
 from formidable.forms.field_builder import (
     FileFieldBuilder, FormFieldFactory, SkipField
 )
+from formidable.forms.validations.plan import (
+    get_validation_plan, get_validation_plan_from_schema
+)
 from formidable.models import Formidable
 from formidable.serializers import FormidableSerializer, SimpleAccessSerializer
+from formidable.serializers.fast import FastFormidableSerializer
 from formidable.serializers.forms import ContextFormSerializer, contextualize
+from formidable.utils import import_cached_object
+from formidable.validators import reference_date
 
 logger = logging.getLogger(__name__)
 
 
 def extract_function(func_name):
     """
-    Return a function out of a namespace
+    Return a function out of a namespace, imported once
 
     Return None if the function is not loadable
     """
     func = None
     try:
-        func = import_from_string(func_name, '')
+        func = import_cached_object(
+            func_name, lambda path: import_from_string(path, '')
+        )
     except (ImportError, ValueError):
         logger.error(
             "An error has occurred impossible to import %s", func_name
@@ -67,10 +82,16 @@ class CallbackMixin:
     failure_callback_settings = ''
     callback_error_message = "An error has occurred with function: `%s`"
 
-    def _call_callback(self, callback):
+    def _call_callback(self, callback, on_commit=False):
         """
         Tool to simply call the callback function and handle edge-cases.
 
+        When a callback executor is set (see :mod:`formidable.callbacks`),
+        the callback is submitted to it instead, after the current
+        transaction is committed if ``on_commit`` is set. The request data
+        is parsed beforehand, since the body of the request can't be read
+        once the response is returned.
+
         **WARNING!** the DRF request is not inherited from django core,
         `HTTPRequest`, and you should not assume they'll behave the same way.
 
@@ -85,6 +106,21 @@ class CallbackMixin:
         # Call function only if existing
         if not func:
             return
+
+        executor = get_callback_executor()
+        if executor is None:
+            self._run_callback(func, callback)
+            return
+        # Parse the data while the request is still being handled
+        self.request.data
+        if on_commit:
+            transaction.on_commit(
+                lambda: executor.submit(self._run_callback, func, callback)
+            )
+        else:
+            executor.submit(self._run_callback, func, callback)
+
+    def _run_callback(self, func, callback):
         try:
             # WARNING! the DRF request is not inherited from django core,
             # `HTTPRequest`, and you should not assume they'll behave the same
@@ -102,7 +138,7 @@ class CallbackMixin:
         Call the failure callback function
         """
         callback = getattr(settings, self.success_callback_settings, None)
-        self._call_callback(callback)
+        self._call_callback(callback, on_commit=True)
 
     def failure_callback(self):
         """
@@ -165,18 +201,84 @@ class MetaClassView(type):
         return super().__new__(mcls, name, bases, attrs)
 
 
-class FormidableDetail(CallbackMixin, ExceptionHandlerMixin,
-                       RetrieveUpdateAPIView, metaclass=MetaClassView):
+class ConditionalGetMixin:
+    """
+    Handle conditional GET requests (``If-None-Match`` and
+    ``If-Modified-Since`` headers) on a form.
+
+    The ETag is derived from the revision and the ``updated_at`` date of the
+    form (see :meth:`formidable.models.Formidable.get_cache_version`), so
+    that a new form reusing the primary key of a deleted one doesn't get its
+    ETag, and the Last-Modified date from its ``updated_at`` column. An
+    unchanged form answers ``304 Not Modified`` out of a single read of the
+    form row, without loading its fields.
+    """
+
+    def get_etag_parts(self, formidable):
+        return [
+            json_version, formidable.pk, formidable.get_cache_version(),
+            self.request.accepted_renderer.format,
+        ]
+
+    def get_etag(self, formidable):
+        parts = ':'.join(str(part) for part in self.get_etag_parts(formidable))
+        return quote_etag(hashlib.md5(parts.encode('utf-8')).hexdigest())
+
+    def get_object(self):
+        # The form is loaded once by ``get``, to compute its ETag
+        formidable = getattr(self, '_conditional_object', None)
+        if formidable is None:
+            formidable = super().get_object()
+        return formidable
+
+    def get(self, request, *args, **kwargs):
+        formidable = self._conditional_object = self.get_object()
+        etag = self.get_etag(formidable)
+        last_modified = None
+        if formidable.updated_at is not None:
+            last_modified = int(formidable.updated_at.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class FormidableDetail(ConditionalGetMixin, CallbackMixin,
+                       ExceptionHandlerMixin, RetrieveUpdateAPIView,
+                       metaclass=MetaClassView):
     queryset = Formidable.objects.all()
     serializer_class = FormidableSerializer
     settings_permission_key = 'FORMIDABLE_PERMISSION_BUILDER'
     success_callback_settings = 'FORMIDABLE_POST_UPDATE_CALLBACK_SUCCESS'
     failure_callback_settings = 'FORMIDABLE_POST_UPDATE_CALLBACK_FAIL'
+    # Serve the schema snapshot of the form, when available, instead of
+    # serializing all its fields.
+    use_schema_snapshot = False
+    # Render the form using the read-only FastFormidableSerializer
+    use_fast_serializer = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.select_for_update = None
 
+    def get_serializer_class(self):
+        if self.use_fast_serializer and self.request.method == 'GET':
+            return FastFormidableSerializer
+        return super().get_serializer_class()
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.use_schema_snapshot:
+            snapshot = self.get_object().get_schema_snapshot()
+            if snapshot is not None:
+                return Response(snapshot)
+        return super().retrieve(request, *args, **kwargs)
+
     def filter_queryset(self, queryset):
         qs = super().filter_queryset(queryset)
         if self.select_for_update:
@@ -211,8 +313,8 @@ class FormidableCreate(CallbackMixin, ExceptionHandlerMixin,
     failure_callback_settings = 'FORMIDABLE_POST_CREATE_CALLBACK_FAIL'
 
 
-class ContextFormDetail(ExceptionHandlerMixin, RetrieveAPIView,
-                        metaclass=MetaClassView):
+class ContextFormDetail(ConditionalGetMixin, ExceptionHandlerMixin,
+                        RetrieveAPIView, metaclass=MetaClassView):
 
     queryset = Formidable.objects.all()
     serializer_class = ContextFormSerializer
@@ -223,6 +325,22 @@ class ContextFormDetail(ExceptionHandlerMixin, RetrieveAPIView,
         context['role'] = get_context(self.request, self.kwargs)
         return context
 
+    def get_etag_parts(self, formidable):
+        parts = super().get_etag_parts(formidable)
+        return parts + [get_context(self.request, self.kwargs)]
+
+    def retrieve(self, request, *args, **kwargs):
+        # Serve the pre-encoded document from the ContextForm store, when
+        # enabled, unless another format (e.g. browsable API) is requested.
+        if get_store() and request.accepted_renderer.format == 'json':
+            document = get_context_form(
+                self.get_object(), get_context(request, self.kwargs)
+            )
+            if document is not None:
+                media_type = request.accepted_renderer.media_type
+                return HttpResponse(document, content_type=media_type)
+        return super().retrieve(request, *args, **kwargs)
+
 
 class AccessList(ExceptionHandlerMixin, APIView,
                  metaclass=MetaClassView):
@@ -249,9 +367,15 @@ class ValidateView(ExceptionHandlerMixin, APIView,
     first the data (without the file).
 
     The final errors in the form are sent to UI in order to display it.
+
+    Set ``use_validation_plan`` to validate the data against a compiled
+    :class:`formidable.forms.validations.plan.ValidationPlan` instead of a
+    form instance. The plan is built out of :meth:`get_form_class_kwargs`,
+    and kept in the validation plan cache.
     """
 
     settings_permission_key = 'FORMIDABLE_PERMISSION_USING'
+    use_validation_plan = False
 
     class ValidationFileFieldBuilder(FileFieldBuilder):
 
@@ -267,6 +391,13 @@ class ValidateView(ExceptionHandlerMixin, APIView,
         except Formidable.DoesNotExist:
             raise exceptions.NotFound()
 
+        if self.use_validation_plan:
+            plan = self.get_validation_plan(formidable)
+            _, errors = plan.validate(**self.get_form_kwargs(request))
+            if errors:
+                return self.data_invalid(errors)
+            return self.data_valid()
+
         form_class = self.get_form_class(formidable)
         form = self.get_form(form_class, request)
         if form.is_valid():
@@ -288,16 +419,27 @@ class ValidateView(ExceptionHandlerMixin, APIView,
             'field_factory': factory,
         }
 
+    def get_validation_plan(self, formidable):
+        return get_validation_plan(
+            formidable, **self.get_form_class_kwargs()
+        )
+
     def form_valid(self, form):
-        # Explicitly return a true empty content, to make sure that the
-        # response Content-Length is correctly calculated.
-        return Response(None, status=status.HTTP_204_NO_CONTENT)
+        return self.data_valid()
 
     def form_invalid(self, form):
         # TODO change response when UI ready
         # data = format_forms_error(form.errors)
         # return Response(data, status=400)
-        return Response(form.errors, status=status.HTTP_400_BAD_REQUEST)
+        return self.data_invalid(form.errors)
+
+    def data_valid(self):
+        # Explicitly return a true empty content, to make sure that the
+        # response Content-Length is correctly calculated.
+        return Response(None, status=status.HTTP_204_NO_CONTENT)
+
+    def data_invalid(self, errors):
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
     def get_form(self, form_class, request):
         return form_class(**self.get_form_kwargs(request))
@@ -312,6 +454,38 @@ class ValidateView(ExceptionHandlerMixin, APIView,
         return {'data': request.data}
 
 
+class BatchValidateView(ValidateView):
+    """
+    Validate a list of data dicts against a form, using its validation plan
+    (see :mod:`formidable.forms.validations.plan`).
+
+    The response contains the errors of each data dict, in the same order,
+    as dicts mapping the field names to their list of error messages (empty
+    for valid data).
+    """
+
+    settings_permission_key = 'FORMIDABLE_PERMISSION_USING'
+
+    def post(self, request, **kwargs):
+        try:
+            formidable = self.get_formidable_object(kwargs)
+        except Formidable.DoesNotExist:
+            raise exceptions.NotFound()
+
+        rows = request.data
+        if not isinstance(rows, list) or \
+                not all(isinstance(data, dict) for data in rows):
+            raise exceptions.ValidationError(
+                'Expected a list of objects.'
+            )
+
+        plan = self.get_validation_plan(formidable)
+        # Validate every data dict against the same date
+        with reference_date():
+            errors = [plan.validate(data)[1] for data in rows]
+        return Response(errors)
+
+
 class ValidateViewFromSchema(ValidateView):
     """
     Acts like `ValidateView` but it uses a Formidable JSON schema
@@ -339,11 +513,20 @@ class ValidateViewFromSchema(ValidateView):
         Retrieve form class from JSON definition, for a given role.
 
         """
+        return get_dynamic_form_class_from_schema(
+            self.get_schema(formidable), field_factory=self.get_field_factory()
+        )
+
+    def get_schema(self, formidable):
         role = get_context(self.request, self.kwargs)
+        return contextualize(formidable, role)
 
-        factory = field_builder.FormFieldFactory(
+    def get_field_factory(self):
+        return field_builder.FormFieldFactory(
             field_map={'file': self.ValidationFileFieldBuilder}
         )
-        schema = contextualize(formidable, role)
-        return get_dynamic_form_class_from_schema(schema,
-                                                  field_factory=factory)
+
+    def get_validation_plan(self, formidable):
+        return get_validation_plan_from_schema(
+            self.get_schema(formidable), self.get_field_factory()
+        )